@@ -0,0 +1,23 @@
+from django.urls import URLPattern, include, path
+
+from api import urls
+from api.async_views import async_read_view
+
+ASYNC_READ_ROUTES = (
+    'titles-list', 'titles-detail', 'reviews-list', 'comments-list',
+)
+
+
+def async_route(pattern):
+    if pattern.name not in ASYNC_READ_ROUTES:
+        return pattern
+    return URLPattern(
+        pattern.pattern, async_read_view(pattern.callback),
+        pattern.default_args, pattern.name
+    )
+
+
+urlpatterns = [
+    path('v1/', include([async_route(p) for p in urls.router_v1.urls])),
+    *urls.urlpatterns,
+]
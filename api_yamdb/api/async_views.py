@@ -0,0 +1,48 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+@functools.lru_cache(maxsize=None)
+def read_executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.ASYNC_READ_WORKERS, thread_name_prefix='api-read'
+    )
+
+
+def run_read(view, request, *args, **kwargs):
+    # Соединения с БД у потоков пула свои: закрываем устаревшие так же,
+    # как это делают сигналы начала и конца запроса.
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_read_view(view):
+    """Асинхронная обёртка синхронного представления DRF для ASGI.
+
+    Django 3.2 не умеет асинхронно работать с ORM, поэтому чтение
+    выполняется в отдельном пуле из ASYNC_READ_WORKERS потоков, а не в
+    общем потоке sync_to_async, через который идут все синхронные
+    представления. Запись остаётся на обычном пути.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await asyncio.get_running_loop().run_in_executor(
+                read_executor(),
+                functools.partial(run_read, view, request, *args, **kwargs)
+            )
+        return await sync_to_async(view)(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,126 @@
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import ADMIN, MODERATOR, User
+
+ROLE_CLAIM = 'role'
+SUPERUSER_CLAIM = 'is_superuser'
+AUTH_VERSION_CLAIM = 'auth_version'
+
+
+class AuthVersions:
+    """Версии авторизации пользователей, чьи токены недавно отзывались.
+
+    Хранятся в памяти процесса: загружаются из БД при первом обращении и
+    перечитываются раз в AUTH_VERSIONS_REFRESH секунд, так что отзыв в
+    другом процессе доходит сюда с этой задержкой, а в этом - сразу.
+    Нужны только отзывы за последние ACCESS_TOKEN_LIFETIME: выданные до
+    более старых токены уже истекли.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versions = {}
+        self.loaded_at = None
+
+    @staticmethod
+    def revocations(cutoff):
+        # Без сортировки по username: иначе SQLite обходит всю таблицу по
+        # индексу username вместо диапазона по user_auth_revoked_idx.
+        return User.all_objects.filter(
+            auth_revoked_at__gte=cutoff
+        ).order_by().values_list('pk', 'auth_version', 'auth_revoked_at')
+
+    def load(self):
+        cutoff = timezone.now() - settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+        versions = {
+            user_id: (version, revoked_at)
+            for user_id, version, revoked_at in self.revocations(cutoff)
+        }
+        with self.lock:
+            # Отзывы этого процесса, которые запрос мог ещё не увидеть.
+            for user_id, (version, revoked_at) in self.versions.items():
+                if revoked_at >= cutoff and version > versions.get(
+                    user_id, (0, None)
+                )[0]:
+                    versions[user_id] = (version, revoked_at)
+            self.versions = versions
+            self.loaded_at = time.monotonic()
+
+    def current(self, user_id):
+        if self.loaded_at is None or (
+            time.monotonic() - self.loaded_at > settings.AUTH_VERSIONS_REFRESH
+        ):
+            self.load()
+        return self.versions.get(user_id, (0, None))[0]
+
+    def revoke(self, user):
+        with self.lock:
+            version, _ = self.versions.get(user.pk, (0, None))
+            if user.auth_version > version:
+                self.versions[user.pk] = (
+                    user.auth_version, user.auth_revoked_at
+                )
+
+    def clear(self):
+        with self.lock:
+            self.versions = {}
+            self.loaded_at = None
+
+
+auth_versions = AuthVersions()
+
+
+class RoleAccessToken(AccessToken):
+    """Токен доступа с ролью и версией авторизации пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token[ROLE_CLAIM] = user.role
+        token[SUPERUSER_CLAIM] = user.is_superuser
+        token[AUTH_VERSION_CLAIM] = user.auth_version
+        return token
+
+
+class RoleTokenUser(TokenUser):
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @cached_property
+    def auth_version(self):
+        return self.token[AUTH_VERSION_CLAIM]
+
+    @property
+    def is_moderator(self):
+        return self.role == MODERATOR
+
+    @property
+    def is_admin(self):
+        return self.role == ADMIN or self.is_superuser
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    """Пользователь из claims токена, без запроса к БД.
+
+    Токены без версии авторизации (выданные до RoleAccessToken)
+    проверяются по-старому, загрузкой пользователя.
+    """
+
+    def get_user(self, validated_token):
+        if AUTH_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user = RoleTokenUser(validated_token)
+        if user.auth_version < auth_versions.current(user.id):
+            raise AuthenticationFailed('Токен отозван.', code='token_revoked')
+        return user
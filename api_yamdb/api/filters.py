@@ -1,6 +1,22 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from reviews.models import ROLES, Genre, GenreAndTitle, Title, User, normalize
+from reviews.search import search_titles
+
+# Больше любого символа в casefold-строке: верхняя граница префикса.
+PREFIX_END = chr(0x10FFFF)
+
+GENRE_MODE_ANY = 'any'
+GENRE_MODE_ALL = 'all'
+GENRE_MODES = (
+    (GENRE_MODE_ANY, 'Любой из жанров'),
+    (GENRE_MODE_ALL, 'Все жанры'),
+)
+
+
+class SlugInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
 
 
 class TitleFilter(filters.FilterSet):
@@ -8,13 +24,63 @@ class TitleFilter(filters.FilterSet):
         field_name='name', lookup_expr='icontains'
     )
     year = filters.NumberFilter(field_name='year')
-    category = filters.CharFilter(
-        field_name='category__slug', lookup_expr='icontains'
+    category = SlugInFilter(
+        field_name='category__slug', lookup_expr='in'
     )
-    genre = filters.CharFilter(
-        field_name='genre__slug', lookup_expr='icontains'
+    genre = SlugInFilter(method='filter_genre')
+    genre_mode = filters.ChoiceFilter(
+        choices=GENRE_MODES, method='filter_genre_mode'
     )
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'category', 'genre',)
+        fields = ('name', 'year', 'category', 'genre', 'genre_mode',
+                  'search',)
+
+    def filter_genre(self, queryset, name, value):
+        title_genres = GenreAndTitle.objects.filter(title=OuterRef('pk'))
+        if self.form.cleaned_data.get('genre_mode') == GENRE_MODE_ALL:
+            for slug in set(value):
+                queryset = queryset.filter(Exists(title_genres.filter(
+                    genre__in=Genre.objects.filter(slug=slug)
+                )))
+            return queryset
+        return queryset.filter(Exists(title_genres.filter(
+            genre__in=Genre.objects.filter(slug__in=value)
+        )))
+
+    def filter_genre_mode(self, queryset, name, value):
+        # Режим учитывается в filter_genre.
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class UserFilter(filters.FilterSet):
+    """Фильтры пользователей, каждый из которых идёт по индексу.
+
+    ?search= ищет по началу username без учёта регистра: диапазон по
+    username_normalized вместо LIKE '%...%' по всей таблице.
+    """
+
+    username = filters.CharFilter(field_name='username')
+    email = filters.CharFilter(method='filter_email')
+    role = filters.ChoiceFilter(choices=ROLES)
+    search = filters.CharFilter(method='filter_search')
+
+    class Meta:
+        model = User
+        fields = ('username', 'email', 'role', 'search')
+
+    def filter_email(self, queryset, name, value):
+        email, = normalize(value)
+        return queryset.filter(email_normalized=email)
+
+    def filter_search(self, queryset, name, value):
+        prefix, = normalize(value.strip())
+        return queryset.filter(
+            username_normalized__gte=prefix,
+            username_normalized__lt=prefix + PREFIX_END
+        ).order_by('username_normalized')
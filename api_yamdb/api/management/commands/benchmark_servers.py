@@ -0,0 +1,156 @@
+import asyncio
+import importlib.util
+import itertools
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+HOST = '127.0.0.1'
+DEFAULT_PATHS = ('/api/v1/titles/', '/api/v1/titles/1/reviews/')
+DEFAULT_THREADS = 16
+
+
+def asgi_command(port, threads):
+    return [
+        'uvicorn', 'api_yamdb.asgi:application', '--host', HOST,
+        '--port', str(port), '--workers', '1', '--log-level', 'warning',
+    ]
+
+
+SERVERS = {
+    # По одному процессу: потоки gthread, стандартный ASGI Django и ASGI с
+    # пулом чтения из стольких же потоков (ASYNC_READ_WORKERS).
+    'wsgi': ('gunicorn', lambda port, threads: [
+        'gunicorn', 'api_yamdb.wsgi:application', '--bind', f'{HOST}:{port}',
+        '--worker-class', 'gthread', '--workers', '1',
+        '--threads', str(threads), '--log-level', 'warning',
+    ], False),
+    'asgi': ('uvicorn', asgi_command, False),
+    'asgi-pool': ('uvicorn', asgi_command, True),
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(f'Сервер на порту {port} не запустился.')
+
+
+async def slow_request(port, path, slow):
+    """Запрос от медленного клиента: заголовки приходят с паузой."""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {HOST}\r\n'.encode())
+        await writer.drain()
+        await asyncio.sleep(slow)
+        writer.write(b'Connection: close\r\n\r\n')
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b' ', 2)[1])
+
+
+async def run_load(port, paths, clients, requests, slow):
+    latencies, errors = [], 0
+    paths = itertools.cycle(paths)
+    remaining = iter(range(requests))
+
+    async def client():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                status = await slow_request(port, next(paths), slow)
+            except (OSError, IndexError, ValueError):
+                status = None
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return latencies, errors, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        'сравнение запросов/с и p99 под WSGI (gunicorn gthread) и ASGI '
+        '(uvicorn, с пулом чтения и без) при множестве медленных клиентов; '
+        'нужны gunicorn и uvicorn и заполненная БД'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument(
+            '--slow-ms', type=int, default=100,
+            help='пауза клиента между началом и концом заголовков'
+        )
+        parser.add_argument(
+            '--threads', type=int, default=DEFAULT_THREADS,
+            help='потоки gunicorn gthread и пула чтения под ASGI'
+        )
+        parser.add_argument('--path', action='append', dest='paths')
+        parser.add_argument(
+            '--server', action='append', dest='servers', choices=SERVERS
+        )
+
+    def handle(self, *args, **options):
+        servers = options['servers'] or list(SERVERS)
+        for name in servers:
+            module, _, _ = SERVERS[name]
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f'Для {name} установите {module}.')
+        for name in servers:
+            self.benchmark(name, options)
+
+    def benchmark(self, name, options):
+        module, command, read_pool = SERVERS[name]
+        port = free_port()
+        env = {
+            **os.environ,
+            'ASYNC_READ_WORKERS': str(options['threads'] if read_pool else 0),
+            'DJANGO_SETTINGS_MODULE': os.environ.get(
+                'DJANGO_SETTINGS_MODULE', 'api_yamdb.settings'
+            ),
+        }
+        server = subprocess.Popen(
+            [sys.executable, '-m', *command(port, options['threads'])],
+            cwd=settings.BASE_DIR, env=env
+        )
+        try:
+            wait_for_port(port)
+            latencies, errors, elapsed = asyncio.run(run_load(
+                port, options['paths'] or DEFAULT_PATHS, options['clients'],
+                options['requests'], options['slow_ms'] / 1000
+            ))
+        finally:
+            server.terminate()
+            server.wait()
+        if len(latencies) < 2:
+            raise CommandError(f'{name}: успешных запросов нет.')
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        self.stdout.write(
+            f'{name}: {len(latencies) / elapsed:8.1f} запросов/с  '
+            f'p50 {statistics.median(latencies) * 1000:8.1f} мс  '
+            f'p99 {p99 * 1000:8.1f} мс  ошибок {errors}'
+        )
@@ -0,0 +1,87 @@
+import random
+import time
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, connection, transaction
+
+from reviews.models import User
+from reviews.outbox import enqueue_email
+from reviews.signup import (
+    SIGNUP_FROM_EMAIL, SIGNUP_MESSAGE, SIGNUP_SUBJECT, signup
+)
+
+
+def legacy_signup(username, email):
+    # Как signup_user до upsert: get_or_create и новый код на каждый запрос.
+    try:
+        with transaction.atomic():
+            user, _ = User.objects.get_or_create(
+                email=email, username=username
+            )
+            enqueue_email(
+                SIGNUP_SUBJECT,
+                SIGNUP_MESSAGE.format(
+                    code=default_token_generator.make_token(user)
+                ),
+                SIGNUP_FROM_EMAIL,
+                email
+            )
+    except IntegrityError:
+        pass
+
+
+SIGNUPS = {'get_or_create': legacy_signup, 'upsert': signup}
+
+
+class Command(BaseCommand):
+    help = (
+        'регистраций в секунду: прежний get_or_create против upsert с '
+        'повторным использованием кода, смесь новых и повторных '
+        'пользователей; данные откатываются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--signups', type=int, default=5000)
+        parser.add_argument(
+            '--repeat-share', type=float, default=0.5,
+            help='доля повторных регистраций уже зарегистрированных'
+        )
+
+    def handle(self, *args, **options):
+        workload = self.workload(options['signups'], options['repeat_share'])
+        for name, function in SIGNUPS.items():
+            self.benchmark(name, function, workload)
+
+    def workload(self, count, repeat_share):
+        rng = random.Random(0)
+        signed_up = []
+        workload = []
+        for index in range(count):
+            if signed_up and rng.random() < repeat_share:
+                workload.append(rng.choice(signed_up))
+                continue
+            pair = (f'bench{index}', f'bench{index}@yamdb.fake')
+            signed_up.append(pair)
+            workload.append(pair)
+        return workload
+
+    def benchmark(self, name, function, workload):
+        queries = 0
+
+        def count_queries(execute, *args):
+            nonlocal queries
+            queries += 1
+            return execute(*args)
+
+        with transaction.atomic():
+            with connection.execute_wrapper(count_queries):
+                started = time.perf_counter()
+                for username, email in workload:
+                    function(username, email)
+                elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        self.stdout.write(
+            f'{name:>13}: {len(workload) / elapsed:8.1f} регистраций/с  '
+            f'запросов на регистрацию {queries / len(workload):4.1f}'
+        )
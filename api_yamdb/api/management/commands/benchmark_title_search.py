@@ -0,0 +1,86 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.filters import TitleFilter
+from reviews.models import Title
+
+SYLLABLES = (
+    'ка', 'ло', 'ми', 'ра', 'сто', 'ве', 'ну', 'ди', 'за', 'по',
+    'ре', 'та', 'гу', 'бо', 'ше', 'ля', 'ти', 'мо', 'се', 'да',
+)
+# Словарь ~8000 слов с частотами по закону Ципфа: есть и частые слова,
+# и редкие, как в настоящих названиях и описаниях.
+WORDS = [
+    first + second + third
+    for first in SYLLABLES for second in SYLLABLES for third in SYLLABLES
+]
+CUM_WEIGHTS = list(itertools.accumulate(
+    1 / rank for rank in range(1, len(WORDS) + 1)
+))
+DEFAULT_QUERIES = (WORDS[0], WORDS[50], WORDS[3000], WORDS[3000][:4])
+BATCH_SIZE = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        'сравнение поиска ?search= (FTS5) с фильтром ?name= (icontains) '
+        'на сгенерированных произведениях; данные откатываются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1_000_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--query', action='append', dest='queries')
+
+    def handle(self, *args, **options):
+        queries = options['queries'] or DEFAULT_QUERIES
+        with transaction.atomic():
+            started = time.perf_counter()
+            self.seed(options['titles'])
+            self.stdout.write(
+                f'Создано произведений: {options["titles"]} '
+                f'за {time.perf_counter() - started:.1f} с'
+            )
+            for query in queries:
+                for param in ('name', 'search'):
+                    self.report(query, param, options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        rng = random.Random(0)
+
+        def text(words_count):
+            return ' '.join(
+                rng.choices(WORDS, cum_weights=CUM_WEIGHTS, k=words_count)
+            )
+
+        for start in range(0, count, BATCH_SIZE):
+            Title.objects.bulk_create(
+                Title(
+                    name=text(3),
+                    year=rng.randint(1900, 2022),
+                    description=text(20),
+                )
+                for _ in range(min(BATCH_SIZE, count - start))
+            )
+
+    def report(self, query, param, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = TitleFilter(
+                {param: query}, queryset=Title.objects.all()
+            ).qs
+            count = queryset.count()
+            list(queryset[:5])
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f'{param:>6} {query!r:<16} найдено {count:>8}  '
+            f'медиана {statistics.median(timings):8.1f} мс  '
+            f'максимум {max(timings):8.1f} мс'
+        )
@@ -0,0 +1,97 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.filters import UserFilter
+from reviews.models import ADMIN, MODERATOR, USER, User, normalize
+
+SYLLABLES = (
+    'ka', 'lo', 'mi', 'ra', 'sto', 've', 'nu', 'di', 'za', 'po',
+    're', 'ta', 'gu', 'bo', 'she', 'lya', 'ti', 'mo', 'se', 'da',
+)
+ROLE_WEIGHTS = ((USER, 980), (MODERATOR, 15), (ADMIN, 5))
+BATCH_SIZE = 10000
+
+
+def old_search(queryset, value):
+    # Как SearchFilter по username до появления username_normalized.
+    return queryset.filter(username__icontains=value)
+
+
+class Command(BaseCommand):
+    help = (
+        'сравнение поиска пользователей ?search= (префикс по индексу) с '
+        'прежним icontains и фильтров ?username=, ?role= на '
+        'сгенерированных пользователях; данные откатываются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            usernames = self.seed(options['users'])
+            self.stdout.write(
+                f'Создано пользователей: {options["users"]} '
+                f'за {time.perf_counter() - started:.1f} с'
+            )
+            sample = usernames[len(usernames) // 2]
+            cases = (
+                ('icontains', sample[:2]),
+                ('search', sample[:2].upper()),
+                ('icontains', sample[:5]),
+                ('search', sample[:5]),
+                ('username', sample),
+                ('role', MODERATOR),
+            )
+            for param, value in cases:
+                self.report(param, value, options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, count):
+        rng = random.Random(0)
+        roles, weights = zip(*ROLE_WEIGHTS)
+        usernames = []
+        for start in range(0, count, BATCH_SIZE):
+            batch = []
+            for index in range(start, min(start + BATCH_SIZE, count)):
+                username = ''.join(rng.choices(SYLLABLES, k=3)) + str(index)
+                if index % 3 == 0:
+                    username = username.capitalize()
+                email = f'{username}@yamdb.fake'
+                username_normalized, email_normalized = normalize(
+                    username, email
+                )
+                batch.append(User(
+                    username=username,
+                    email=email,
+                    username_normalized=username_normalized,
+                    email_normalized=email_normalized,
+                    role=rng.choices(roles, weights)[0],
+                ))
+                usernames.append(username)
+            User.objects.bulk_create(batch)
+        return usernames
+
+    def report(self, param, value, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = User.objects.all()
+            if param == 'icontains':
+                queryset = old_search(queryset, value)
+            else:
+                queryset = UserFilter({param: value}, queryset=queryset).qs
+            count = queryset.count()
+            list(queryset[:5])
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f'{param:>9} {value!r:<18} найдено {count:>8}  '
+            f'медиана {statistics.median(timings):8.1f} мс  '
+            f'максимум {max(timings):8.1f} мс'
+        )
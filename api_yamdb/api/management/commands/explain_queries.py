@@ -0,0 +1,405 @@
+import json
+import re
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework import filters
+from rest_framework.test import APIClient
+
+from api.mixins import SparseFieldsMixin
+from api.pagination import CursorOrPageNumberPagination
+from api.urls import router_v1
+from reviews.aggregates import recalculate_title_ratings
+from reviews.bulk import bulk_create_with_pks
+from reviews.models import (
+    ADMIN, Category, Comment, Genre, GenreAndTitle, Review, Title, User
+)
+
+TABLE_SCAN = 'table_scan'
+TEMP_BTREE = 'temp_btree'
+MISSING_COVERING_INDEX = 'missing_covering_index'
+KINDS = (TABLE_SCAN, TEMP_BTREE, MISSING_COVERING_INDEX)
+# Покрывающий индекс предлагается, только если запросу нужно не больше
+# стольких колонок таблицы: более широкий индекс дублирует саму таблицу.
+MAX_COVERING_COLUMNS = 4
+
+PLAN_ACCESS_RE = re.compile(
+    r'^(?P<op>SCAN|SEARCH) (?P<alias>\w+)'
+    r'(?: USING (?P<automatic>AUTOMATIC )?(?P<covering>COVERING )?'
+    r'INDEX(?: (?P<index>\w+))?| USING (?:INTEGER )?PRIMARY KEY'
+    r'|(?P<virtual> VIRTUAL TABLE))?'
+)
+PLAN_TEMP_RE = re.compile(r'^USE TEMP B-TREE FOR (?P<purpose>.+)$')
+TABLE_RE = re.compile(
+    r'(?:FROM|JOIN) "(?P<table>\w+)"'
+    r'(?: (?!(?:ON|WHERE|INNER|LEFT|ORDER|GROUP|LIMIT|AS)\b)(?P<alias>\w+))?'
+)
+COLUMN_RE = re.compile(
+    r'"(?P<alias>\w+)"\."(?P<column>\w+)"'
+    r'(?:\s*(?P<operator>=|<=|>=|<|>|IN\b|LIKE\b|GLOB\b|BETWEEN\b)'
+    r'(?P<join>\s*\(?")?)?'
+)
+ORDER_COLUMN_RE = re.compile(
+    r'"(?P<alias>\w+)"\."(?P<column>\w+)"(?: ASC|(?P<descending> DESC))?'
+)
+RANGE_OPERATORS = ('<=', '>=', '<', '>', 'LIKE', 'GLOB', 'BETWEEN')
+
+# Значения фильтров по модели filterset: у пользователей свои name/search.
+FILTER_SAMPLES = {
+    Title: {
+        'name': lambda samples: {'name': samples[Title].name.split()[0]},
+        'year': lambda samples: {'year': samples[Title].year},
+        'category': lambda samples: {'category': samples[Category].slug},
+        'genre': lambda samples: {'genre': samples[Genre].slug},
+        'genre_mode': lambda samples: {
+            'genre': samples[Genre].slug, 'genre_mode': 'all'
+        },
+        'search': lambda samples: {
+            'search': samples[Title].name.split()[0]
+        },
+    },
+    User: {
+        'username': lambda samples: {'username': samples[User].username},
+        'email': lambda samples: {'email': samples[User].email.upper()},
+        'role': lambda samples: {'role': samples[User].role},
+        'search': lambda samples: {'search': samples[User].username[:7]},
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN QUERY PLAN для всех запросов API на сгенерированных данных: '
+        'полные сканы, временные B-деревья и непокрывающие индексы '
+        'с предложенными индексами, отчёт в JSON; данные откатываются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=200)
+        parser.add_argument('--output', help='файл для отчёта')
+        parser.add_argument(
+            '--baseline',
+            help='прошлый отчёт: находки из него не считаются новыми'
+        )
+        parser.add_argument(
+            '--fail-on', action='append', choices=KINDS, default=[],
+            help='завершиться с ошибкой при новых находках этого вида'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('EXPLAIN QUERY PLAN поддерживается в SQLite.')
+        with transaction.atomic():
+            samples = self.seed(options['titles'])
+            report = self.collect(samples)
+            transaction.set_rollback(True)
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+        known = set()
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                known = {
+                    finding['fingerprint']
+                    for finding in json.load(file)['findings']
+                }
+        new = [
+            finding['fingerprint'] for finding in report['findings']
+            if finding['kind'] in options['fail_on']
+            and finding['fingerprint'] not in known
+        ]
+        if new:
+            raise CommandError(
+                'Новые проблемы в планах запросов: ' + ', '.join(new)
+            )
+
+    def seed(self, titles_count):
+        categories = bulk_create_with_pks(Category, [
+            Category(name=f'Категория {idx}', slug=f'explain-category-{idx}')
+            for idx in range(5)
+        ])
+        genres = bulk_create_with_pks(Genre, [
+            Genre(name=f'Жанр {idx}', slug=f'explain-genre-{idx}')
+            for idx in range(10)
+        ])
+        titles = bulk_create_with_pks(Title, [
+            Title(
+                name=f'Произведение{idx % 7} номер {idx}',
+                year=1950 + idx % 70,
+                description=f'Описание {idx}',
+                category=categories[idx % len(categories)],
+            )
+            for idx in range(titles_count)
+        ])
+        GenreAndTitle.objects.bulk_create(
+            GenreAndTitle(title=title, genre=genres[(idx + shift) % 10])
+            for idx, title in enumerate(titles)
+            for shift in (0, 3)
+        )
+        users = bulk_create_with_pks(User, [
+            User(username=f'explain_user{idx}', email=f'explain{idx}@x.fake')
+            for idx in range(20)
+        ])
+        Review.objects.bulk_create(
+            Review(author=user, title=title, text='Отзыв', score=idx % 10 + 1)
+            for idx, user in enumerate(users)
+            for title in titles[:50]
+        )
+        recalculate_title_ratings(Title.objects.filter(
+            pk__in=[title.pk for title in titles]
+        ))
+        review = Review.objects.filter(title=titles[0]).first()
+        Comment.objects.bulk_create(
+            Comment(author=user, review=review, text='Комментарий')
+            for user in users
+        )
+        admin = User.objects.create(
+            username='explain_admin', email='explain_admin@x.fake',
+            role=ADMIN
+        )
+        return {
+            Category: categories[0],
+            Genre: genres[0],
+            Title: titles[0],
+            Review: review,
+            Comment: review.comments.first(),
+            User: admin,
+            'title_id': titles[0].pk,
+            'review_id': review.pk,
+        }
+
+    def get_endpoints(self, samples):
+        # Вложенные префиксы роутера заданы регулярками с ^, reverse() их
+        # не собирает, поэтому URL строятся из префикса напрямую.
+        root = reverse('api-root')
+        for prefix, viewset, basename in router_v1.registry:
+            url = root + re.sub(
+                r'\(\?P<(\w+)>[^)]*\)',
+                lambda match: str(samples[match[1]]),
+                prefix.lstrip('^')
+            ) + '/'
+            obj = samples[viewset.serializer_class.Meta.model]
+            detail_url = f'{url}{getattr(obj, viewset.lookup_field)}/'
+            if hasattr(viewset, 'list'):
+                yield f'{basename}-list', url, {}
+                for variant, params in self.get_list_variants(
+                    viewset, url, samples
+                ):
+                    yield f'{basename}-list?{variant}', url, params
+            if hasattr(viewset, 'retrieve'):
+                yield f'{basename}-detail', detail_url, {}
+            for extra_action in viewset.get_extra_actions():
+                if 'get' not in extra_action.mapping:
+                    continue
+                base = detail_url if extra_action.detail else url
+                yield (
+                    f'{basename}-{extra_action.url_name}',
+                    f'{base}{extra_action.url_path}/',
+                    {}
+                )
+
+    def get_list_variants(self, viewset, url, samples):
+        obj = samples[viewset.serializer_class.Meta.model]
+        filterset_class = getattr(viewset, 'filterset_class', None)
+        if filterset_class is not None:
+            model_samples = FILTER_SAMPLES.get(filterset_class._meta.model, {})
+            for name in filterset_class.base_filters:
+                if name in model_samples:
+                    params = model_samples[name](samples)
+                    yield '&'.join(sorted(params)), params
+                else:
+                    self.skipped.append(f'{viewset.__name__}.{name}')
+        backends = viewset.filter_backends
+        if filters.SearchFilter in backends and viewset.search_fields:
+            field = viewset.search_fields[0].lstrip('^=@$')
+            yield 'search', {'search': str(getattr(obj, field))[:3]}
+        if filters.OrderingFilter in backends:
+            for field in getattr(viewset, 'ordering_fields', None) or ():
+                yield f'ordering=-{field}', {'ordering': f'-{field}'}
+        if issubclass(viewset.pagination_class, CursorOrPageNumberPagination):
+            keyset = viewset.pagination_class.keyset_class()
+            keyset.base_url = url
+            yield 'cursor', {'cursor': ''}
+            link = keyset.encode_cursor(obj, reverse=False)
+            yield 'cursor=next', {
+                'cursor': parse_qs(urlparse(link).query)['cursor'][0]
+            }
+        if issubclass(viewset, SparseFieldsMixin):
+            yield 'fields', {'fields': 'id'}
+
+    def collect(self, samples):
+        self.skipped = []
+        client = APIClient()
+        client.force_authenticate(user=samples[User])
+        endpoints, findings = [], {}
+        dummy_cache = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+            }
+        }
+        with override_settings(CACHES=dummy_cache):
+            for name, url, params in self.get_endpoints(samples):
+                statements = []
+
+                def capture(execute, sql, sql_params, many, context):
+                    if sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                        statements.append((sql, sql_params))
+                    return execute(sql, sql_params, many, context)
+
+                with connection.execute_wrapper(capture):
+                    response = client.get(url, params)
+                queries = []
+                for sql, sql_params in statements:
+                    plan = self.explain(sql, sql_params)
+                    query_findings = self.analyze(sql, plan)
+                    for finding in query_findings:
+                        fingerprint = (
+                            f'{name}:{finding["kind"]}:{finding["table"]}'
+                        )
+                        findings.setdefault(fingerprint, {
+                            'fingerprint': fingerprint,
+                            'endpoint': name,
+                            **finding,
+                            'sql': sql,
+                        })
+                    queries.append({
+                        'sql': sql, 'plan': plan, 'findings': query_findings
+                    })
+                endpoints.append({
+                    'name': name,
+                    'url': url,
+                    'params': params,
+                    'status': response.status_code,
+                    'queries': queries,
+                })
+        return {
+            'vendor': connection.vendor,
+            'endpoints': endpoints,
+            'findings': list(findings.values()),
+            'skipped_filters': self.skipped,
+        }
+
+    def explain(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[3] for row in cursor.fetchall()]
+
+    def analyze(self, sql, plan):
+        aliases = {
+            match['alias'] or match['table']: match['table']
+            for match in TABLE_RE.finditer(sql)
+        }
+        findings = []
+        for detail in plan:
+            access = PLAN_ACCESS_RE.match(detail)
+            temp = PLAN_TEMP_RE.match(detail)
+            if access and access['alias'] in aliases and (
+                not access['virtual']
+            ):
+                alias = access['alias']
+                if access['automatic'] or (
+                    access['op'] == 'SCAN' and not access['index']
+                ):
+                    kind = TABLE_SCAN
+                elif access['index'] and not access['covering']:
+                    kind = MISSING_COVERING_INDEX
+                else:
+                    continue
+            elif temp:
+                kind = TEMP_BTREE
+                order = self.order_columns(sql)
+                if order is None:
+                    continue
+                alias = order[0][0] if order else next(iter(aliases), None)
+                if alias not in aliases:
+                    continue
+            else:
+                continue
+            suggestion = self.suggest(sql, aliases[alias], alias, kind)
+            if kind == MISSING_COVERING_INDEX and suggestion is None:
+                continue
+            findings.append({
+                'kind': kind,
+                'table': aliases[alias],
+                'detail': detail,
+                'suggested_index': suggestion,
+            })
+        return findings
+
+    @staticmethod
+    def order_columns(sql):
+        _, found, order_by = sql.rpartition(' ORDER BY ')
+        if not found:
+            return []
+        order = []
+        for term in order_by.split(' LIMIT ')[0].split(','):
+            match = ORDER_COLUMN_RE.fullmatch(term.strip())
+            if match is None:
+                # Сортировка по выражению (например, рангу поиска):
+                # индексом её не заменить.
+                return None
+            order.append((
+                match['alias'],
+                match['column'] + (' DESC' if match['descending'] else '')
+            ))
+        return order
+
+    @staticmethod
+    def classify_columns(sql, alias):
+        columns = {'equal': [], 'join': [], 'range': [], 'referenced': []}
+        for match in COLUMN_RE.finditer(sql):
+            if match['alias'] != alias:
+                continue
+            if match['join']:
+                columns['join'].append(match['column'])
+            elif match['operator'] in ('=', 'IN'):
+                columns['equal'].append(match['column'])
+            elif match['operator'] in RANGE_OPERATORS:
+                columns['range'].append(match['column'])
+            columns['referenced'].append(match['column'])
+        return columns
+
+    def suggest(self, sql, table, alias, kind):
+        columns = self.classify_columns(sql, alias)
+        if 'id' in columns['equal']:
+            # Поиск по первичному ключу: индекс здесь ничего не даст.
+            return None
+        order = [
+            column for order_alias, column in self.order_columns(sql) or ()
+            if order_alias == alias
+        ]
+        if kind == TEMP_BTREE:
+            index = columns['equal'] + order if order else []
+        elif kind == TABLE_SCAN:
+            index = columns['equal'] + columns['range'][:1] + order
+        else:
+            index = list(dict.fromkeys(
+                columns['equal'] + columns['join'] + columns['range'][:1]
+                + order + columns['referenced']
+            ))
+            if len({column.split()[0] for column in index} - {'id'}) > (
+                MAX_COVERING_COLUMNS
+            ):
+                return None
+        if not index:
+            return None
+        index = list(dict.fromkeys(index))
+        name = '_'.join(column.split()[0] for column in index)
+        quoted = ', '.join(
+            ' '.join([f'"{column.split()[0]}"', *column.split()[1:]])
+            for column in index
+        )
+        return {
+            'table': table,
+            'columns': index,
+            'sql': f'CREATE INDEX "{table}_{name}_idx" ON "{table}" '
+                   f'({quoted})',
+        }
@@ -0,0 +1,70 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.validators import UniqueValidator
+
+from api.serializers import UserBulkItemSerializer, UserRoleItemSerializer
+from api.views import validate_bulk
+from api_yamdb.settings import USER_BULK_MAX_SIZE
+from reviews.bulk import create_users, update_roles
+
+
+class Command(BaseCommand):
+    help = (
+        'создание пользователей или смена их ролей из файла в формате '
+        'static/data/users.csv; колонка id не используется'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--roles', action='store_true',
+            help='не создавать пользователей, а сменить роли существующим'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf8') as file:
+                rows = list(csv.DictReader(file))
+        except OSError as error:
+            raise CommandError(f'Не удалось прочитать файл: {error}')
+        done = failed = 0
+        for start in range(0, len(rows), USER_BULK_MAX_SIZE):
+            chunk = rows[start:start + USER_BULK_MAX_SIZE]
+            results = self.import_chunk(chunk, options['roles'])
+            for line, result in enumerate(results, start=start + 2):
+                if 'errors' in result:
+                    failed += 1
+                    self.stdout.write(f'Строка {line}: {result["errors"]}')
+                else:
+                    done += 1
+        action = 'Обновлено' if options['roles'] else 'Создано'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action}: {done}, ошибок: {failed}'
+        ))
+
+    def import_chunk(self, rows, roles):
+        if roles:
+            results, items, positions = validate_bulk(
+                rows, UserRoleItemSerializer, USER_BULK_MAX_SIZE,
+                'пользователей'
+            )
+            _, errors = update_roles(items, 'Пользователь не найден.')
+        else:
+            results, items, positions = validate_bulk(
+                [self.clean_row(row) for row in rows],
+                UserBulkItemSerializer, USER_BULK_MAX_SIZE, 'пользователей'
+            )
+            _, errors = create_users(items, UniqueValidator.message)
+        for position, index in enumerate(positions):
+            results[index] = {'errors': errors[position]} if (
+                position in errors
+            ) else {}
+        return results
+
+    def clean_row(self, row):
+        # Пустые колонки в CSV означают «не задано», а не пустую строку.
+        return {
+            name: value for name, value in row.items()
+            if name != 'id' and value
+        }
@@ -0,0 +1,217 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import permissions, serializers, status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from reviews.cache import get_generations
+
+
+class CachedResponseMixin:
+    cache_models = ()
+
+    def get_response_cache_key(self, request):
+        if getattr(self, '_response_cache_key', None):
+            return self._response_cache_key
+        query = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+        digest = hashlib.md5(
+            repr((request.build_absolute_uri(request.path), query)).encode()
+        ).hexdigest()
+        generations = '.'.join(
+            str(generation)
+            for generation in get_generations(self.cache_models)
+        )
+        self._response_cache_key = (
+            f'response:{self.basename}:{self.action}:{generations}:{digest}'
+        )
+        return self._response_cache_key
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalResponseMixin:
+    """ETag по данным ответа и 304 для If-None-Match.
+
+    Хеш считается по уже полученной странице (или по ответу из кеша), без
+    отдельного агрегата по всей выборке. В него входит всё, что видит
+    клиент: username автора, жанры, ссылки и счётчик пагинации, - так что
+    удаление, переименование автора или смена жанра меняют ETag.
+    Last-Modified не отдаётся: удаление строки его бы не сдвинуло.
+    """
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        response = handler(request, *args, **kwargs)
+        if not status.is_success(response.status_code):
+            return response
+        etag = quote_etag(hashlib.md5(json.dumps(
+            response.data, cls=JSONEncoder, ensure_ascii=False
+        ).encode()).hexdigest())
+        response = get_conditional_response(
+            request, etag=etag, response=response
+        )
+        response['ETag'] = etag
+        return response
+
+
+class ConditionalListMixin(ConditionalResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+def related_columns(field):
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, serializers.ManyRelatedField):
+        field = field.child_relation
+    if isinstance(field, serializers.BaseSerializer):
+        return [
+            nested.source for nested in field.fields.values()
+            if nested.source != '*' and '.' not in nested.source
+        ]
+    if isinstance(field, serializers.SlugRelatedField):
+        return [field.slug_field]
+    return []
+
+
+class SparseFieldsMixin:
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_query_param_list(self, name):
+        value = self.request.query_params.get(name, '')
+        return {item.strip() for item in value.split(',') if item.strip()}
+
+    def get_sparse_fields(self):
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+        self._sparse_fields = None
+        requested = self.get_query_param_list(self.fields_query_param)
+        omitted = self.get_query_param_list(self.omit_query_param)
+        if self.request.method not in permissions.SAFE_METHODS or not (
+            requested or omitted
+        ):
+            return None
+        fields = self.get_serializer_class()(
+            context=self.get_serializer_context()
+        ).fields
+        unknown = (requested | omitted) - set(fields)
+        if unknown:
+            raise serializers.ValidationError({
+                self.fields_query_param: (
+                    f'Неизвестные поля: {", ".join(sorted(unknown))}'
+                )
+            })
+        self._sparse_fields = {
+            name: field for name, field in fields.items()
+            if (not requested or name in requested) and name not in omitted
+        }
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in set(target.fields) - set(sparse_fields):
+                target.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields is None:
+            return queryset
+        return self.project_queryset(queryset, sparse_fields.values())
+
+    def project_queryset(self, queryset, fields):
+        model = queryset.model
+        only, select_related, prefetch_related = [], [], []
+        for field in fields:
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                continue
+            columns = related_columns(field)
+            if model_field.many_to_many:
+                prefetch_related.append(Prefetch(
+                    field.source,
+                    queryset=model_field.related_model.objects.only(*columns)
+                ))
+                continue
+            only.append(field.source)
+            if model_field.many_to_one and columns:
+                select_related.append(field.source)
+                only.extend(f'{field.source}__{column}' for column in columns)
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset.only(*only)
+
+
+class ParentResourceMixin:
+    """Родительский объект вложенного маршрута, один запрос на запрос.
+
+    parent_lookups сопоставляет поля родительской модели с аргументами
+    URL, поэтому вся цепочка (например, отзыв и его произведение)
+    проверяется одним запросом; parent_filters добавляет к нему условия
+    вроде «произведение не удалено».
+    """
+
+    parent_model = None
+    parent_lookups = {}
+    parent_filters = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            lookups = {
+                field: self.kwargs.get(kwarg)
+                for field, kwarg in self.parent_lookups.items()
+            }
+            self._parent = get_object_or_404(
+                self.parent_model.objects.only(*lookups),
+                **lookups, **self.parent_filters
+            )
+        return self._parent
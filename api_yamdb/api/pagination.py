@@ -0,0 +1,201 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import BigIntegerField, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    ordering = ('-pk',)
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        position, self.reverse = self.decode_cursor(request, queryset.model)
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [self.invert(field) for field in ordering]
+        queryset = self.load_ordering_fields(queryset.order_by(*ordering))
+        if position is not None:
+            queryset = queryset.filter(self.seek(ordering, position))
+
+        page = list(queryset[:self.page_size + 1])
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if self.reverse:
+            page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = page
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def load_ordering_fields(self, queryset):
+        # Курсор строится из полей сортировки: если выборка ограничена
+        # через only(), они должны загружаться сразу, а не по одному.
+        fields, defer = queryset.query.deferred_loading
+        if defer or not fields:
+            return queryset
+        return queryset.only(
+            *fields, *(field.lstrip('-') for field in self.ordering)
+        )
+
+    @staticmethod
+    def encode_value(value):
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        raise TypeError(f'{type(value).__name__} нельзя записать в курсор')
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def seek(ordering, position):
+        """Условие «строго после position» для составного ключа ordering.
+
+        Первое поле дополнительно ограничено нестрогим неравенством,
+        чтобы БД могла пройти по индексу диапазоном.
+        """
+        lookups = [
+            (field.lstrip('-'), 'lt' if field.startswith('-') else 'gt')
+            for field in ordering
+        ]
+        first_field, first_lookup = lookups[0]
+        condition = Q()
+        equal = Q()
+        for (field, lookup), value in zip(lookups, position):
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        first = Q(**{f'{first_field}__{first_lookup}e': position[0]})
+        return first & condition
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = data['p'], bool(data['r'])
+            position = self.clean_position(model, position)
+        except (
+            TypeError, ValueError, KeyError, binascii.Error,
+            DjangoValidationError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def clean_position(self, model, position):
+        # Курсор приходит от клиента: значения приводятся к типам полей
+        # сортировки, иначе подделанный курсор падает уже в запросе.
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise ValueError('неверная длина курсора')
+        fields = [
+            model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            for name in (field.lstrip('-') for field in self.ordering)
+        ]
+        cleaned = []
+        for field, value in zip(fields, position):
+            # Не field.clean(): для первичного ключа он пропускает None.
+            value = field.to_python(value)
+            if value is None:
+                raise ValueError(f'пустое значение {field.name}')
+            # SQLite не задаёт диапазон целых полей, а больше 64 бит
+            # драйвер не передаёт.
+            if isinstance(value, int) and not (
+                -BigIntegerField.MAX_BIGINT - 1 <= value
+                <= BigIntegerField.MAX_BIGINT
+            ):
+                raise ValueError(f'{field.name} вне диапазона')
+            field.run_validators(value)
+            cleaned.append(value)
+        return cleaned
+
+    def encode_cursor(self, obj, reverse):
+        position = [
+            getattr(obj, field.lstrip('-')) for field in self.ordering
+        ]
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(
+                {'p': position, 'r': int(reverse)},
+                default=self.encode_value
+            ).encode()
+        ).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+
+class TitleKeysetPagination(KeysetPagination):
+    ordering = ('-year', 'name', 'id')
+
+
+class ReviewKeysetPagination(KeysetPagination):
+    ordering = ('-pub_date', 'id')
+
+
+class CursorOrPageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация, либо keyset-пагинация при `?cursor=`.
+
+    Keyset-пагинация сортирует по своему ключу, поэтому `?ordering=`
+    вместе с курсором отклоняется.
+    """
+
+    keyset_class = None
+    ordering_with_cursor_message = (
+        'Курсор задаёт свой порядок и не сочетается с ordering.'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            if api_settings.ORDERING_PARAM in request.query_params:
+                raise ValidationError(
+                    {api_settings.ORDERING_PARAM: [
+                        self.ordering_with_cursor_message
+                    ]}
+                )
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(CursorOrPageNumberPagination):
+    keyset_class = TitleKeysetPagination
+
+
+class ReviewPagination(CursorOrPageNumberPagination):
+    keyset_class = ReviewKeysetPagination
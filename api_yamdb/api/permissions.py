@@ -17,7 +17,7 @@ class IsAuthorModerAdminOrReadOnly(permissions.BasePermission):
 
         if request.method in ['PUT', 'PATCH', 'DELETE']:
             return (
-                obj.author == request.user
+                obj.author_id == request.user.id
                 or request.user.is_moderator
                 or request.user.is_admin
             )
@@ -0,0 +1,28 @@
+import json
+
+from rest_framework import renderers
+
+from reviews.export import CSV, NDJSON
+
+
+class ExportRenderer(renderers.BaseRenderer):
+    """Форматы выгрузки для ?format= и Accept.
+
+    Данные выгрузки отдаются потоком мимо рендерера, через render()
+    проходят только ответы с ошибками.
+    """
+
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, ensure_ascii=False).encode() + b'\n'
+
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = NDJSON
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = 'text/csv'
+    format = CSV
@@ -1,24 +1,34 @@
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
 from api_yamdb.settings import (
     EMAIL_MAX_LENGTH,
+    NAME_MAX_LENGTH,
+    SLUG_MAX_LENGTH,
     USER_NAME_MAX_LENGTH
 )
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (
+    ROLES, SCORES, USER, Category, Comment, Genre, Review, Title, User,
+    score_field
+)
 from reviews.validators import validate_year, validate_username
 
 
 class UserSerializer(serializers.ModelSerializer):
+    # Удалённые пользователи держат username и email до purge_deleted,
+    # поэтому уникальность проверяется и по ним.
     username = serializers.CharField(
         max_length=USER_NAME_MAX_LENGTH,
         required=True,
         validators=[
             validate_username,
-            UniqueValidator(queryset=User.objects.all()),
+            UniqueValidator(queryset=User.all_objects.all()),
         ]
     )
+    email = serializers.EmailField(
+        max_length=EMAIL_MAX_LENGTH,
+        validators=[UniqueValidator(queryset=User.all_objects.all())]
+    )
 
     class Meta:
         model = User
@@ -33,6 +43,32 @@ class UserSerializer(serializers.ModelSerializer):
         lookup_field = 'username'
 
 
+class UserBulkItemSerializer(serializers.Serializer):
+    # Уникальность проверяет reviews.bulk.create_users для всей пачки.
+    username = serializers.CharField(
+        max_length=USER_NAME_MAX_LENGTH,
+        validators=[validate_username]
+    )
+    email = serializers.EmailField(max_length=EMAIL_MAX_LENGTH)
+    role = serializers.ChoiceField(choices=ROLES, default=USER)
+    bio = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True
+    )
+    first_name = serializers.CharField(
+        max_length=USER_NAME_MAX_LENGTH, required=False, allow_blank=True,
+        allow_null=True
+    )
+    last_name = serializers.CharField(
+        max_length=USER_NAME_MAX_LENGTH, required=False, allow_blank=True,
+        allow_null=True
+    )
+
+
+class UserRoleItemSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=USER_NAME_MAX_LENGTH)
+    role = serializers.ChoiceField(choices=ROLES)
+
+
 class GetTokenSerializer(serializers.Serializer):
     username = serializers.CharField(
         max_length=USER_NAME_MAX_LENGTH,
@@ -59,7 +95,7 @@ class CommentSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('updated_at',)
         model = Comment
         read_only_fields = ('review',)
 
@@ -72,18 +108,16 @@ class ReviewSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('updated_at',)
         model = Review
-        read_only_fields = ('title',)
+        read_only_fields = ('title', 'comments_count')
 
     def validate(self, data):
-        title_id = self.context['view'].kwargs['title_id']
         request = self.context['request']
-        author = request.user
-        title = get_object_or_404(Title, id=title_id)
+        title = self.context['view'].get_title()
         if (
-            title.reviews.filter(author=author).exists()
-            and request.method != 'PATCH'
+            request.method != 'PATCH'
+            and title.reviews.filter(author_id=request.user.pk).exists()
         ):
             raise serializers.ValidationError(
                 'Можно оставлять только один отзыв!'
@@ -121,15 +155,24 @@ class TitleCreateAndUpdateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+
+
+class TitleBulkItemSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=NAME_MAX_LENGTH)
+    year = serializers.IntegerField(validators=[validate_year])
+    description = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True
+    )
+    genre = serializers.ListField(
+        child=serializers.SlugField(max_length=SLUG_MAX_LENGTH)
+    )
+    category = serializers.SlugField(max_length=SLUG_MAX_LENGTH)
 
 
 class TitleSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
-    rating = serializers.IntegerField(
-        source='reviews__score__avg', read_only=True
-    )
 
     class Meta:
         model = Title
@@ -137,3 +180,23 @@ class TitleSerializer(serializers.ModelSerializer):
             'name', 'year', 'description', 'category', 'genre', 'id', 'rating'
         )
         read_only_fields = fields
+
+
+class ScoreDistributionSerializer(serializers.ModelSerializer):
+    count = serializers.IntegerField(source='rating_count', read_only=True)
+    distribution = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Title
+        fields = ('id', 'rating', 'count', 'distribution')
+        read_only_fields = fields
+
+    def get_distribution(self, title):
+        return {
+            str(score): getattr(title, score_field(score))
+            for score in SCORES
+        }
+
+
+class ExportSerializer(serializers.Serializer):
+    since = serializers.DateTimeField(required=False)
@@ -0,0 +1,97 @@
+import hashlib
+import math
+from collections.abc import Mapping
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Скользящее окно по двум счётчикам в кеше вместо списка времён.
+
+    Число запросов за последние duration секунд оценивается как счётчик
+    текущего окна плюс доля предыдущего, ещё попадающая в интервал.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        self.elapsed = elapsed
+        current_key = f'{self.key}:{int(window)}'
+        previous_key = f'{self.key}:{int(window) - 1}'
+        counts = self.cache.get_many((current_key, previous_key))
+        self.current = counts.get(current_key, 0)
+        self.previous = counts.get(previous_key, 0)
+        if self.estimate(elapsed) >= self.num_requests:
+            return False
+        self.cache.add(current_key, 0, 2 * self.duration)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            # Счётчик вытеснили между add и incr.
+            self.cache.set(current_key, 1, 2 * self.duration)
+        return True
+
+    def estimate(self, elapsed):
+        return (
+            self.previous * (1 - elapsed / self.duration) + self.current
+        )
+
+    def wait(self):
+        """Секунды до момента, когда оценка опустится ниже лимита."""
+        if self.current >= self.num_requests:
+            # Ждём конца окна и затухания его счётчика в следующем.
+            wait = self.duration - self.elapsed + self.duration * (
+                1 - self.num_requests / self.current
+            )
+        else:
+            wait = self.duration * (
+                1 - (self.num_requests - self.current) / self.previous
+            ) - self.elapsed
+        return max(1, math.ceil(wait))
+
+
+class IPThrottle(SlidingWindowThrottle):
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request)
+        }
+
+
+class UsernameThrottle(SlidingWindowThrottle):
+    """Лимит по username из тела запроса, без обращения к БД.
+
+    В ключ идёт хеш: username ещё не провалидирован.
+    """
+
+    def get_cache_key(self, request, view):
+        # Тело может быть JSON-массивом: его отклонит сериализатор.
+        if not isinstance(request.data, Mapping):
+            return None
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.md5(username.lower().encode()).hexdigest()
+        }
+
+
+class SignupIPThrottle(IPThrottle):
+    scope = 'signup_ip'
+
+
+class SignupUsernameThrottle(UsernameThrottle):
+    scope = 'signup_username'
+
+
+class TokenIPThrottle(IPThrottle):
+    scope = 'token_ip'
+
+
+class TokenUsernameThrottle(UsernameThrottle):
+    scope = 'token_username'
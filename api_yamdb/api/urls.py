@@ -8,6 +8,7 @@ from api.views import (
     GenreViewSet,
     ReviewViewSet,
     UserViewSet,
+    export_data,
     signup_user,
     get_token
 )
@@ -40,5 +41,6 @@ auth_patterns = [
 
 urlpatterns = [
     path('v1/auth/', include(auth_patterns)),
+    path('v1/export/<slug:resource>/', export_data, name='export'),
     path('v1/', include(router_v1.urls)),
 ]
@@ -1,60 +1,161 @@
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from rest_framework import filters, mixins, viewsets, status, serializers
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (
+    action, api_view, permission_classes, renderer_classes,
+    throttle_classes
+)
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
-
-from api.filters import TitleFilter
+from rest_framework.validators import UniqueValidator
+from api.authentication import RoleAccessToken, auth_versions
+from api.filters import TitleFilter, UserFilter
+from api.mixins import (
+    CachedListMixin, CachedRetrieveMixin,
+    ConditionalListMixin, ConditionalRetrieveMixin,
+    ParentResourceMixin, SparseFieldsMixin
+)
+from api.pagination import ReviewPagination, TitlePagination
+from api.renderers import CSVRenderer, NDJSONRenderer
+from api_yamdb.settings import TITLE_BULK_MAX_SIZE, USER_BULK_MAX_SIZE
 from api.permissions import (
     IsAdmin, IsAdminOrReadOnly,
     IsAuthorModerAdminOrReadOnly
 )
 from api.serializers import (
-    CategorySerializer, CommentSerializer,
+    CategorySerializer, CommentSerializer, ExportSerializer,
     GenreSerializer, GetTokenSerializer,
-    ReviewSerializer, SignUpSerializer,
+    ReviewSerializer, ScoreDistributionSerializer,
+    SignUpSerializer, TitleBulkItemSerializer,
     TitleCreateAndUpdateSerializer, TitleSerializer,
-    UserSerializer
+    UserBulkItemSerializer, UserRoleItemSerializer, UserSerializer
+)
+from api.throttling import (
+    SignupIPThrottle, SignupUsernameThrottle,
+    TokenIPThrottle, TokenUsernameThrottle
+)
+from reviews.bulk import create_titles, create_users, update_roles
+from reviews.export import EXPORTS, iter_export
+from reviews.models import (
+    SCORE_FIELDS, Category, Comment, Genre, GenreAndTitle, Review, Title,
+    User
 )
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.signup import CONFLICT, signup
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+def validate_bulk(data, serializer_class, max_size, objects_name):
+    """Проверяет элементы пачки по отдельности.
+
+    Возвращает список результатов с ошибками невалидных элементов,
+    данные валидных и их позиции в пачке.
+    """
+    if not isinstance(data, list):
+        raise serializers.ValidationError(
+            f'Ожидается список {objects_name}.'
+        )
+    if len(data) > max_size:
+        raise serializers.ValidationError(
+            f'Не больше {max_size} {objects_name} за запрос.'
+        )
+    results = [None] * len(data)
+    items, positions = [], []
+    for index, item in enumerate(data):
+        serializer = serializer_class(data=item)
+        if serializer.is_valid():
+            items.append(serializer.validated_data)
+            positions.append(index)
+        else:
+            results[index] = {'errors': serializer.errors}
+    return results, items, positions
+
+
+def bulk_response(results, done, success_status):
+    if not done:
+        response_status = status.HTTP_400_BAD_REQUEST
+    elif done < len(results):
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = success_status
+    return Response(results, status=response_status)
+
+
+def with_live_authors(queryset):
+    """Без удалённых авторов; автор подтягивается JOIN-ом, только username."""
+    return queryset.filter(author__deleted_at__isnull=True).select_related(
+        'author'
+    ).only(
+        *(field.name for field in queryset.model._meta.concrete_fields),
+        'author__username'
+    )
+
+
+class CommentViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    ParentResourceMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet
+):
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorModerAdminOrReadOnly,)
+    pagination_class = ReviewPagination
+    parent_model = Review
+    parent_lookups = {'pk': 'review_id', 'title': 'title_id'}
+    parent_filters = {
+        'title__deleted_at__isnull': True,
+        'author__deleted_at__isnull': True,
+    }
 
     def get_review(self):
-        return get_object_or_404(Review, pk=self.kwargs.get('review_id'))
+        return self.get_parent()
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        # Не через related manager: он проставляет review в каждый объект
+        # и при ?fields= дочитывает review_id отдельным запросом на строку.
+        return with_live_authors(
+            Comment.objects.filter(review=self.get_review())
+        )
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(
+            author_id=self.request.user.pk, review=self.get_review()
+        )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    ParentResourceMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet
+):
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorModerAdminOrReadOnly,)
+    pagination_class = ReviewPagination
+    parent_model = Title
+    parent_lookups = {'pk': 'title_id'}
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        return self.get_parent()
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return with_live_authors(
+            Review.objects.filter(title=self.get_title())
+        )
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        serializer.save(
+            author_id=self.request.user.pk, title=self.get_title()
+        )
 
 
 class GetPostDelete(
+    ConditionalListMixin,
+    CachedListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -69,90 +170,164 @@ class GetPostDelete(
 class CategoryViewSet(GetPostDelete):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_models = (Category,)
 
 
 class GenreViewSet(GetPostDelete):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_models = (Genre,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        Avg('reviews__score')
-    ).order_by('-year', 'name')
+class TitleViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    SparseFieldsMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('-year', 'name')
     serializer_class = TitleSerializer
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
     filterset_class = TitleFilter
     ordering_fields = ('rating', 'name')
+    pagination_class = TitlePagination
+    cache_models = (Title, Genre, Category, GenreAndTitle, Review)
 
     def get_serializer_class(self):
         if self.request.method in ('POST', 'PATCH'):
             return TitleCreateAndUpdateSerializer
         return TitleSerializer
 
+    def perform_destroy(self, instance):
+        instance.soft_delete()
+
+    @action(detail=True, url_path='score-distribution')
+    def score_distribution(self, request, pk=None):
+        title = get_object_or_404(
+            Title.objects.only('rating', 'rating_count', *SCORE_FIELDS),
+            pk=pk
+        )
+        return Response(ScoreDistributionSerializer(title).data)
+
+    @action(detail=False, methods=('POST',))
+    def bulk(self, request):
+        results, items, positions = validate_bulk(
+            request.data, TitleBulkItemSerializer, TITLE_BULK_MAX_SIZE,
+            'произведений'
+        )
+        created, errors = create_titles(
+            items,
+            serializers.SlugRelatedField.default_error_messages[
+                'does_not_exist'
+            ]
+        )
+        for position, index in enumerate(positions):
+            if position in errors:
+                results[index] = {'errors': errors[position]}
+            else:
+                results[index] = {
+                    'id': created[position].pk, **items[position]
+                }
+        return bulk_response(results, len(created), status.HTTP_201_CREATED)
+
 
 class UserViewSet(viewsets.ModelViewSet):
     http_method_names = ['get', 'post', 'head', 'delete', 'patch']
     queryset = User.objects.all()
     permission_classes = (IsAdmin,)
     serializer_class = UserSerializer
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter)
-    search_fields = ('username',)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = UserFilter
     lookup_field = 'username'
 
+    def perform_update(self, serializer):
+        # Версию авторизации при смене роли поднимает User.save().
+        auth_version = serializer.instance.auth_version
+        user = serializer.save()
+        if user.auth_version != auth_version:
+            auth_versions.revoke(user)
+
+    def perform_destroy(self, instance):
+        instance.soft_delete()
+        auth_versions.revoke(instance)
+
+    @action(detail=False, methods=('POST', 'PATCH'))
+    def bulk(self, request):
+        if request.method == 'POST':
+            return self.bulk_create(request)
+        return self.bulk_update_roles(request)
+
+    def bulk_create(self, request):
+        results, items, positions = validate_bulk(
+            request.data, UserBulkItemSerializer, USER_BULK_MAX_SIZE,
+            'пользователей'
+        )
+        created, errors = create_users(items, UniqueValidator.message)
+        for position, index in enumerate(positions):
+            if position in errors:
+                results[index] = {'errors': errors[position]}
+            else:
+                results[index] = UserSerializer(created[position]).data
+        return bulk_response(results, len(created), status.HTTP_201_CREATED)
+
+    def bulk_update_roles(self, request):
+        results, items, positions = validate_bulk(
+            request.data, UserRoleItemSerializer, USER_BULK_MAX_SIZE,
+            'пользователей'
+        )
+        updated, errors = update_roles(items, 'Пользователь не найден.')
+        for user in updated.values():
+            auth_versions.revoke(user)
+        for position, index in enumerate(positions):
+            if position in errors:
+                results[index] = {'errors': errors[position]}
+            else:
+                results[index] = {
+                    'username': updated[position].username,
+                    'role': updated[position].role,
+                }
+        return bulk_response(results, len(updated), status.HTTP_200_OK)
+
     @action(
         detail=False,
         methods=('GET', 'PATCH'),
         permission_classes=(IsAuthenticated,),
     )
     def me(self, request):
+        # request.user собран из токена, профиль читается из БД.
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'GET':
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(user)
             return Response(serializer.data)
 
         serializer = self.get_serializer(
-            request.user, data=request.data, partial=True
+            user, data=request.data, partial=True
         )
         serializer.is_valid(raise_exception=True)
         if serializer.validated_data.get('role'):
-            serializer.validated_data['role'] = request.user.role
+            serializer.validated_data['role'] = user.role
         serializer.save()
         return Response(serializer.data)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([SignupIPThrottle, SignupUsernameThrottle])
 def signup_user(request):
     serializer = SignUpSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    email = serializer.validated_data['email']
-    username = serializer.validated_data['username']
-    try:
-        user, _ = User.objects.get_or_create(
-            email=email,
-            username=username
-        )
-    except IntegrityError:
+    # Письмо с кодом отправит deliver_emails: ответ не ждёт почтовый сервер.
+    if signup(
+        serializer.validated_data['username'],
+        serializer.validated_data['email']
+    ) == CONFLICT:
         raise serializers.ValidationError('Такой пользователь уже существует')
-
-    confirmation_code = default_token_generator.make_token(user)
-
-    message = (
-        f'Ваш код: {confirmation_code}\n'
-        'Перейдите по адресу '
-        'http://127.0.0.1:8000/api/v1/auth/token/ и введите его '
-        'вместе со своим username'
-    )
-
-    send_mail(
-        'Завершение регистрации',
-        message,
-        'webmaster@localhost',
-        [email, ],
-        fail_silently=True
-    )
     return Response(
         serializer.data,
         status=status.HTTP_200_OK
@@ -161,6 +336,7 @@ def signup_user(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([TokenIPThrottle, TokenUsernameThrottle])
 def get_token(request):
     serializer = GetTokenSerializer(data=request.data)
     if serializer.is_valid():
@@ -169,7 +345,7 @@ def get_token(request):
         user = get_object_or_404(User, username=username)
 
         if default_token_generator.check_token(user, confirmation_code):
-            access = AccessToken.for_user(user)
+            access = RoleAccessToken.for_user(user)
             return Response(
                 {
                     'token': f'Bearer {access}',
@@ -180,3 +356,29 @@ def get_token(request):
         serializer.errors,
         status=status.HTTP_400_BAD_REQUEST
     )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+@renderer_classes([NDJSONRenderer, CSVRenderer])
+def export_data(request, resource):
+    if resource not in EXPORTS:
+        raise NotFound(f'Нет выгрузки {resource}.')
+    serializer = ExportSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    renderer = request.accepted_renderer
+    gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+    response = StreamingHttpResponse(
+        iter_export(
+            resource, renderer.format,
+            since=serializer.validated_data.get('since'), gzip=gzip
+        ),
+        content_type=f'{renderer.media_type}; charset={renderer.charset}'
+    )
+    filename = f'{resource}.{renderer.format}'
+    if gzip:
+        response['Content-Encoding'] = 'gzip'
+        filename += '.gz'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Vary'] = 'Accept, Accept-Encoding'
+    return response
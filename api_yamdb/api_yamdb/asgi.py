@@ -9,8 +9,22 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+
+class YamdbASGIHandler(ASGIHandler):
+    """При ASYNC_READ_WORKERS > 0 использует маршруты с асинхронным чтением."""
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None and settings.ASYNC_READ_WORKERS:
+            request.urlconf = 'api_yamdb.asgi_urls'
+        return request, error_response
+
+
+django.setup(set_prefix=False)
+application = YamdbASGIHandler()
@@ -0,0 +1,9 @@
+from django.urls import include, path
+
+from api_yamdb.urls import urlpatterns as wsgi_urlpatterns
+
+# Под ASGI маршруты API с асинхронным чтением идут первыми.
+urlpatterns = [
+    path('api/', include('api.async_urls')),
+    *wsgi_urlpatterns,
+]
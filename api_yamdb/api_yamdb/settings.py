@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from datetime import timedelta
 
@@ -66,17 +67,38 @@ AUTH_USER_MODEL = 'reviews.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.RoleJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': (
         'rest_framework.pagination.PageNumberPagination'
     ),
     'PAGE_SIZE': 5,
+    # Лимиты для signup и token (api/throttling.py), счётчики - в CACHES.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '20/hour',
+        'signup_username': '5/hour',
+        'token_ip': '60/minute',
+        'token_username': '10/minute',
+    },
+    # Сколько прокси перед приложением. Без него лимиты по IP брали бы адрес
+    # из X-Forwarded-For, который клиент подставляет сам.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# Письма пишутся в очередь (reviews.OutgoingEmail) и отправляются командой
+# deliver_emails. EMAIL_OUTBOX_EAGER отправляет их сразу после коммита.
+EMAIL_OUTBOX_EAGER = False
+EMAIL_OUTBOX_MAX_ATTEMPTS = 8
+# Пауза перед повтором, с; удваивается с каждой неудачной попыткой.
+EMAIL_OUTBOX_BACKOFF = 30
+# На сколько секунд воркер забирает пачку писем себе.
+EMAIL_OUTBOX_LEASE = 300
+# Повторная регистрация в течение этого времени, с, не выпускает новый код.
+SIGNUP_CONFIRMATION_WINDOW = 60 * 10
+
 
 # Database
 
@@ -88,6 +110,36 @@ DATABASES = {
 }
 
 
+# Cache
+# Общий для всех процессов файловый кеш: счётчики поколений из reviews.cache
+# меняют и веб-воркеры, и команды manage.py (recalculate_ratings, importcsv,
+# purge_deleted). С LocMemCache у каждого процесса свой кеш, и сброс из
+# команды воркеры бы не увидели.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv(
+            'CACHE_DIR', os.path.join(tempfile.gettempdir(), 'api_yamdb_cache')
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = 60 * 15
+
+# Потоки для чтения каталога и отзывов под ASGI (см. api/async_views.py).
+# 0 - пул выключен: в замерах benchmark_servers на одном CPU он не быстрее
+# стандартного ASGI, потому что синхронные middleware всё равно идут через
+# общий поток sync_to_async.
+ASYNC_READ_WORKERS = int(os.getenv('ASYNC_READ_WORKERS', 0))
+
+# Как часто процесс перечитывает версии авторизации (отзыв токенов) из БД.
+AUTH_VERSIONS_REFRESH = 60
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -161,3 +213,6 @@ SLUG_MAX_LENGTH = 50
 USER_NAME_MAX_LENGTH = 150
 EMAIL_MAX_LENGTH = 254
 NAME_MAX_LENGTH = 256
+TITLE_BULK_MAX_SIZE = 5000
+USER_BULK_MAX_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
@@ -1,7 +1,8 @@
 from django.contrib import admin
 
 from reviews.models import (
-    Category, Comment, Genre, GenreAndTitle, Review, Title, User
+    Category, Comment, Genre, GenreAndTitle, OutgoingEmail, Review, Title,
+    User
 )
 
 admin.site.register(User)
@@ -11,3 +12,4 @@ admin.site.register(Genre)
 admin.site.register(Title)
 admin.site.register(Category)
 admin.site.register(GenreAndTitle)
+admin.site.register(OutgoingEmail)
@@ -0,0 +1,84 @@
+from collections import Counter
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
+
+from reviews.models import SCORES, Comment, Review, Title, score_field
+
+
+def update_title_scores(title_id, added=None, removed=None):
+    deltas = Counter()
+    if added is not None:
+        deltas[added] += 1
+    if removed is not None:
+        deltas[removed] -= 1
+    deltas = {score: delta for score, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    rating_sum = F('rating_sum') + sum(
+        score * delta for score, delta in deltas.items()
+    )
+    rating_count = F('rating_count') + sum(deltas.values())
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=rating_sum / NullIf(rating_count, 0),
+        updated_at=timezone.now(),
+        **{
+            score_field(score): F(score_field(score)) + delta
+            for score, delta in deltas.items()
+        }
+    )
+
+
+def related_count(queryset, field):
+    rows = queryset.filter(
+        **{field: OuterRef('pk')}
+    ).order_by().values(field)
+    return Coalesce(
+        Subquery(
+            rows.annotate(value=Count('pk')).values('value'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def title_reviews_count(**filters):
+    return related_count(Review.objects.filter(**filters), 'title')
+
+
+def update_comments_count(review_id, delta):
+    Review.objects.filter(pk=review_id).update(
+        comments_count=F('comments_count') + delta,
+        updated_at=timezone.now(),
+    )
+
+
+def recalculate_comments_counts(queryset=None):
+    """Исправляет comments_count только у разошедшихся отзывов."""
+    if queryset is None:
+        queryset = Review.objects.all()
+    comments_count = related_count(Comment.objects.all(), 'review')
+    return queryset.exclude(comments_count=comments_count).update(
+        comments_count=comments_count,
+        updated_at=timezone.now(),
+    )
+
+
+def recalculate_title_ratings(queryset=None):
+    if queryset is None:
+        queryset = Title.objects.all()
+    queryset.update(**{
+        score_field(score): title_reviews_count(score=score)
+        for score in SCORES
+    })
+    rating_sum = sum(score * F(score_field(score)) for score in SCORES)
+    rating_count = sum(F(score_field(score)) for score in SCORES)
+    return queryset.update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=rating_sum / NullIf(rating_count, 0),
+        updated_at=timezone.now(),
+    )
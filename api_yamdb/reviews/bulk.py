@@ -0,0 +1,147 @@
+from django.db import transaction
+
+from reviews.cache import bump_generation
+from reviews.models import Category, Genre, GenreAndTitle, Title, User
+
+
+def bulk_create_with_pks(model, objects):
+    created = model.objects.bulk_create(objects)
+    if created and created[0].pk is None:
+        # SQLite в Django 3.2 не возвращает id из bulk_create. Вставка
+        # держит блокировку записи до конца транзакции, поэтому новые
+        # id идут подряд и совпадают с последними id таблицы.
+        pks = model.objects.order_by('-pk').values_list(
+            'pk', flat=True
+        )[:len(created)]
+        for obj, pk in zip(created, reversed(list(pks))):
+            obj.pk = pk
+    return created
+
+
+def resolve_slugs(model, slugs):
+    return dict(
+        model.objects.filter(slug__in=set(slugs)).values_list('slug', 'pk')
+    )
+
+
+def create_titles(items, missing_slug_message):
+    """Создаёт произведения из провалидированных данных.
+
+    Слаги жанров и категорий разрешаются одним запросом на модель.
+    Возвращает словари {индекс элемента: произведение} и
+    {индекс элемента: ошибки}; элементы с ошибками пропускаются.
+    """
+    genres = resolve_slugs(
+        Genre, (slug for item in items for slug in item['genre'])
+    )
+    categories = resolve_slugs(Category, (item['category'] for item in items))
+
+    errors = {}
+    valid = []
+    for index, item in enumerate(items):
+        item_errors = {}
+        missing = [slug for slug in item['genre'] if slug not in genres]
+        if missing:
+            item_errors['genre'] = [
+                missing_slug_message.format(slug_name='slug', value=slug)
+                for slug in missing
+            ]
+        if item['category'] not in categories:
+            item_errors['category'] = [missing_slug_message.format(
+                slug_name='slug', value=item['category']
+            )]
+        if item_errors:
+            errors[index] = item_errors
+        else:
+            valid.append((index, item))
+
+    with transaction.atomic():
+        titles = bulk_create_with_pks(Title, [
+            Title(
+                name=item['name'],
+                year=item['year'],
+                description=item.get('description'),
+                category_id=categories[item['category']],
+            )
+            for _, item in valid
+        ])
+        GenreAndTitle.objects.bulk_create(
+            GenreAndTitle(title_id=title.pk, genre_id=genres[slug])
+            for title, (_, item) in zip(titles, valid)
+            for slug in dict.fromkeys(item['genre'])
+        )
+        if titles:
+            bump_generation(Title, GenreAndTitle)
+    return {index: title for title, (index, _) in zip(titles, valid)}, errors
+
+
+def find_duplicates(items, field, existing_query):
+    """Индексы элементов, чьё значение field уже занято.
+
+    Занятые значения в БД ищутся одним запросом, повторы внутри пачки -
+    в памяти: повтор получает ошибку, первое вхождение - нет.
+    """
+    values = {item[field] for item in items}
+    taken = set(existing_query.filter(
+        **{f'{field}__in': values}
+    ).values_list(field, flat=True))
+    duplicates = set()
+    for index, item in enumerate(items):
+        if item[field] in taken:
+            duplicates.add(index)
+        taken.add(item[field])
+    return duplicates
+
+
+def create_users(items, unique_message):
+    """Создаёт пользователей из провалидированных данных.
+
+    Уникальность username и email проверяется одним запросом на поле,
+    с учётом мягко удалённых пользователей. Возвращает словари
+    {индекс элемента: пользователь} и {индекс элемента: ошибки}.
+    """
+    errors = {}
+    for field in ('username', 'email'):
+        for index in find_duplicates(items, field, User.all_objects):
+            errors.setdefault(index, {})[field] = [unique_message]
+    valid = [
+        (index, item) for index, item in enumerate(items)
+        if index not in errors
+    ]
+    users = []
+    for _, item in valid:
+        user = User(**item)
+        user.set_unusable_password()
+        user.set_normalized()
+        users.append(user)
+    with transaction.atomic():
+        users = bulk_create_with_pks(User, users)
+    return {index: user for user, (index, _) in zip(users, valid)}, errors
+
+
+def update_roles(items, missing_message):
+    """Меняет роли пользователям одним bulk_update.
+
+    Тем, чья роль изменилась, увеличивает версию авторизации: их токены
+    нужно отозвать. Возвращает
+    словари {индекс элемента: пользователь} и {индекс элемента: ошибки}.
+    """
+    users = User.objects.only(
+        'username', 'role', 'auth_version', 'auth_revoked_at'
+    ).in_bulk({item['username'] for item in items}, field_name='username')
+    updated, errors, changed = {}, {}, {}
+    for index, item in enumerate(items):
+        user = users.get(item['username'])
+        if user is None:
+            errors[index] = {'username': [missing_message]}
+            continue
+        if user.role != item['role']:
+            user.role = item['role']
+            user.revoke_tokens()
+            changed[user.pk] = user
+        updated[index] = user
+    with transaction.atomic():
+        User.objects.bulk_update(
+            changed.values(), ('role', 'auth_version', 'auth_revoked_at')
+        )
+    return updated, errors
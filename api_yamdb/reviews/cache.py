@@ -0,0 +1,40 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+GENERATION_KEY = 'generation:{}'
+
+
+def generation_key(model):
+    return GENERATION_KEY.format(model._meta.label_lower)
+
+
+def new_generation():
+    # Вытесненный из кеша счётчик не должен начинаться заново с уже
+    # использованного значения, поэтому стартуем с текущего времени.
+    return time.time_ns()
+
+
+def get_generations(models):
+    keys = [generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            generation = new_generation()
+            cache.add(key, generation, timeout=None)
+            generations[key] = cache.get(key, generation)
+    return [generations[key] for key in keys]
+
+
+def increment_generation(model):
+    # Новое значение, а не incr: в файловом кеше incr не атомарен, и два
+    # процесса могли бы записать одно и то же поколение.
+    cache.set(generation_key(model), new_generation(), timeout=None)
+
+
+def bump_generation(*models):
+    # После коммита: иначе конкурентный запрос успеет закешировать
+    # ещё не закоммиченные данные под новым поколением.
+    for model in models:
+        transaction.on_commit(lambda model=model: increment_generation(model))
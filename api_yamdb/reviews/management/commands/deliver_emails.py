@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'отправка писем из очереди пачками через одно соединение с '
+        'повторами и паузами после ошибок'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='работать постоянно, проверяя очередь раз в --interval с'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_pending(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(f'Отправлено: {sent}, ошибок: {failed}')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
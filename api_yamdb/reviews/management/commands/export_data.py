@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from reviews.export import EXPORTS, FORMATS, NDJSON, iter_export
+
+
+class Command(BaseCommand):
+    help = 'потоковая выгрузка произведений, отзывов или комментариев'
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=EXPORTS)
+        parser.add_argument('--format', choices=FORMATS, default=NDJSON)
+        parser.add_argument(
+            '--since', help='только записи не старше даты (ISO 8601)'
+        )
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--output', help='файл; по умолчанию stdout')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError('Некорректная дата в --since.')
+        chunks = iter_export(
+            options['resource'], options['format'],
+            since=since, gzip=options['gzip']
+        )
+        if options['output']:
+            with open(options['output'], 'wb') as file:
+                file.writelines(chunks)
+        else:
+            stream = self.stdout.buffer
+            for chunk in chunks:
+                stream.write(chunk)
+            stream.flush()
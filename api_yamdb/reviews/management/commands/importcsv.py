@@ -2,6 +2,10 @@ import csv
 
 from django.core.management.base import BaseCommand
 
+from reviews.aggregates import (
+    recalculate_comments_counts, recalculate_title_ratings
+)
+from reviews.cache import bump_generation
 from reviews.models import Category, Comment, Genre, Review, Title, User
 
 
@@ -24,7 +28,11 @@ def csv_import(csv_data, model):
             if field in row:
                 row[f'{field}_id'] = row[field]
                 del row[field]
-        objects.append(model(**row))
+        obj = model(**row)
+        if model is User:
+            # bulk_create не вызывает save(), где заполняются эти поля.
+            obj.set_normalized()
+        objects.append(obj)
     model.objects.bulk_create(objects)
 
 
@@ -39,6 +47,9 @@ class Command(BaseCommand):
                 encoding='utf8'
             ) as csv_file:
                 csv_import(csv.DictReader(csv_file), model)
+        recalculate_title_ratings()
+        recalculate_comments_counts()
+        bump_generation(*DICT)
         self.stdout.write(
             self.style.SUCCESS(
                 'Загрузка завершена'
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.purge import purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        'удаление мягко удалённых произведений и пользователей вместе с '
+        'отзывами и комментариями небольшими транзакциями'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='пауза между пачками, с'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='работать постоянно, проверяя очередь раз в --interval с'
+        )
+        parser.add_argument('--interval', type=float, default=60)
+
+    def handle(self, *args, **options):
+        while True:
+            self.purge(options['batch_size'], options['pause'])
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def purge(self, batch_size, pause):
+        totals = {}
+        purged = 0
+        for obj, name, count in purge_deleted(batch_size, pause):
+            label = f'{type(obj).__name__} {obj.pk}'
+            if name is None:
+                purged += 1
+                self.stdout.write(f'{label}: удалён')
+                continue
+            key = (label, name)
+            totals[key] = totals.get(key, 0) + count
+            self.stdout.write(f'{label}: {name} {totals[key]}')
+        self.stdout.write(self.style.SUCCESS(f'Удалено объектов: {purged}'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.aggregates import recalculate_comments_counts
+
+
+class Command(BaseCommand):
+    help = 'сверка счётчиков комментариев отзывов с комментариями'
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            fixed = recalculate_comments_counts()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Исправлено отзывов: {fixed}'
+            )
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.aggregates import recalculate_title_ratings
+from reviews.cache import bump_generation
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'пересчёт рейтингов произведений по отзывам'
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            updated = recalculate_title_ratings()
+            bump_generation(Title)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Пересчитано произведений: {updated}'
+            )
+        )
@@ -0,0 +1,56 @@
+# Generated by Django 3.2 on 2026-10-18 16:44
+
+from django.db import migrations, models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
+
+
+def fill_title_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+
+    def aggregate(expression):
+        return Coalesce(
+            Subquery(
+                reviews.annotate(value=expression).values('value'),
+                output_field=IntegerField()
+            ),
+            0
+        )
+
+    Title.objects.update(
+        rating_sum=aggregate(Sum('score')),
+        rating_count=aggregate(Count('pk')),
+    )
+    Title.objects.update(
+        rating=F('rating_sum') / NullIf(F('rating_count'), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_title_ratings, migrations.RunPython.noop),
+    ]
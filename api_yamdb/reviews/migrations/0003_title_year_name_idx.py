@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-year', 'name', 'id'], name='title_year_name_idx'),
+        ),
+    ]
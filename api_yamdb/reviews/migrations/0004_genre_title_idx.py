@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 16:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_year_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='genreandtitle',
+            index=models.Index(fields=['title', 'genre'], name='genre_title_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.2 on 2026-10-18 17:19
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_count(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    comments = Comment.objects.filter(
+        review=OuterRef('pk')
+    ).order_by().values('review')
+    Review.objects.update(comments_count=Coalesce(
+        Subquery(
+            comments.annotate(value=Count('pk')).values('value'),
+            output_field=IntegerField()
+        ),
+        0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_review_comment_pub_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
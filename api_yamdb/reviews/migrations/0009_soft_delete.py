@@ -0,0 +1,40 @@
+# Generated by Django 3.2 on 2026-10-18 17:28
+
+import django.contrib.auth.models
+from django.db import migrations, models
+import reviews.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_review_comments_count'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', reviews.models.LiveUserManager()),
+                ('all_objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата удаления'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата удаления'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(condition=models.Q(deleted_at__isnull=False), fields=['deleted_at'], name='title_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(deleted_at__isnull=False), fields=['deleted_at'], name='user_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 17:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='auth_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия авторизации'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2 on 2026-10-18 17:42
+
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def fill_normalized(apps, schema_editor):
+    User = apps.get_model('reviews', 'User')
+    users = User._base_manager.only('username', 'email')
+    batch = []
+    for user in users.iterator(chunk_size=BATCH_SIZE):
+        user.username_normalized = user.username.casefold()
+        user.email_normalized = user.email.casefold()
+        batch.append(user)
+        if len(batch) == BATCH_SIZE:
+            User._base_manager.bulk_update(
+                batch, ('username_normalized', 'email_normalized')
+            )
+            batch = []
+    User._base_manager.bulk_update(
+        batch, ('username_normalized', 'email_normalized')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_normalized',
+            field=models.CharField(default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_normalized',
+            field=models.CharField(default='', editable=False, max_length=150),
+        ),
+        migrations.RunPython(fill_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['username_normalized'], name='user_username_normalized_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email_normalized'], name='user_email_normalized_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['role', 'username'], name='user_role_idx'),
+        ),
+    ]
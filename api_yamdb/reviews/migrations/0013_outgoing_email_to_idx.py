@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_user_normalized'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(fields=['to', 'created_at'], name='email_to_created_idx'),
+        ),
+    ]
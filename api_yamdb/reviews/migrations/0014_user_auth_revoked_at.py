@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-18 18:23
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_revoked(apps, schema_editor):
+    # Когда были прежние отзывы, неизвестно: считаем их только что
+    # сделанными, чтобы ещё не истёкшие токены оставались отозванными.
+    User = apps.get_model('reviews', 'User')
+    User._base_manager.filter(auth_version__gt=0).update(
+        auth_revoked_at=timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_outgoing_email_to_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='auth_revoked_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата отзыва токенов'),
+        ),
+        migrations.RunPython(mark_revoked, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(auth_revoked_at__isnull=False), fields=['auth_revoked_at'], name='user_auth_revoked_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_user_auth_revoked_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='lease',
+            field=models.CharField(blank=True, editable=False, max_length=32, verbose_name='Аренда'),
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(condition=models.Q(sent_at__isnull=True), fields=['lease'], name='email_lease_idx'),
+        ),
+    ]
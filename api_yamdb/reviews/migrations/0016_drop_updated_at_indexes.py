@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 18:38
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_outgoing_email_lease'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_updated_idx',
+        ),
+    ]
@@ -1,6 +1,7 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from api_yamdb.settings import (
     NAME_MAX_LENGTH,
@@ -22,6 +23,39 @@ ROLES = [
 ]
 
 ROLE_MAX_LENGTH = max(len(role) for role, _ in ROLES)
+# Поля пользователя, которые попадают в токен доступа или запрещают его.
+AUTH_FIELDS = ('role', 'is_superuser', 'is_active')
+
+MIN_SCORE = 1
+MAX_SCORE = 10
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+
+def score_field(score):
+    return f'score_{score}'
+
+
+SCORE_FIELDS = tuple(score_field(score) for score in SCORES)
+
+
+def normalize(*values):
+    """Значения для поиска без учёта регистра."""
+    return [(value or '').casefold() for value in values]
+
+
+class LiveManagerMixin:
+    """Скрывает мягко удалённые объекты; все строки - в all_objects."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class LiveManager(LiveManagerMixin, models.Manager):
+    pass
+
+
+class LiveUserManager(LiveManagerMixin, UserManager):
+    pass
 
 
 class User(AbstractUser):
@@ -57,12 +91,123 @@ class User(AbstractUser):
         choices=ROLES,
         default='user'
     )
+    deleted_at = models.DateTimeField('Дата удаления', null=True, blank=True)
+    auth_version = models.PositiveIntegerField(
+        'Версия авторизации', default=0, editable=False
+    )
+    auth_revoked_at = models.DateTimeField(
+        'Дата отзыва токенов', null=True, blank=True, editable=False
+    )
+    # Для поиска без учёта регистра по индексу: заполняются в save().
+    username_normalized = models.CharField(
+        max_length=USER_NAME_MAX_LENGTH, editable=False, default=''
+    )
+    email_normalized = models.CharField(
+        max_length=EMAIL_MAX_LENGTH, editable=False, default=''
+    )
+
+    objects = LiveUserManager()
+    all_objects = UserManager()
 
     class Meta:
         ordering = ('username',)
+        indexes = [
+            models.Index(
+                fields=('deleted_at',), name='user_deleted_idx',
+                condition=models.Q(deleted_at__isnull=False)
+            ),
+            # Частичные: поиск и фильтры идут по живым пользователям, и
+            # count() для пагинации читает только индекс.
+            models.Index(
+                fields=('username_normalized',),
+                name='user_username_normalized_idx',
+                condition=models.Q(deleted_at__isnull=True)
+            ),
+            models.Index(
+                fields=('role', 'username'), name='user_role_idx',
+                condition=models.Q(deleted_at__isnull=True)
+            ),
+            models.Index(
+                fields=('email_normalized',), name='user_email_normalized_idx'
+            ),
+            # Процессы перечитывают только недавние отзывы токенов.
+            models.Index(
+                fields=('auth_revoked_at',), name='user_auth_revoked_idx',
+                condition=models.Q(auth_revoked_at__isnull=False)
+            ),
+        ]
         verbose_name = 'Пользователь',
         verbose_name_plural = 'Пользователи'
 
+    def set_normalized(self):
+        self.username_normalized, self.email_normalized = normalize(
+            self.username, self.email
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_auth = instance.auth_state()
+        return instance
+
+    def auth_state(self):
+        # Только загруженные поля: обращение к отложенному - лишний запрос.
+        loaded = self.__dict__
+        return {
+            field: loaded[field] for field in (*AUTH_FIELDS, 'auth_version')
+            if field in loaded
+        }
+
+    def auth_changed(self, update_fields=None):
+        saved = getattr(self, '_saved_auth', None)
+        if not saved:
+            return False
+        current = self.auth_state()
+        # Версию уже подняли (например, soft_delete) - второй раз не нужно.
+        if current.get('auth_version') != saved.get('auth_version'):
+            return False
+        return any(
+            current.get(field) != saved[field]
+            for field in AUTH_FIELDS
+            if field in saved and (
+                update_fields is None or field in update_fields
+            )
+        )
+
+    def save(self, *args, **kwargs):
+        self.set_normalized()
+        # Токены несут роль в claims: её смена откуда угодно (админка,
+        # shell, API) должна их отозвать.
+        update_fields = kwargs.get('update_fields')
+        revoke = self.auth_changed(update_fields)
+        if revoke:
+            self.revoke_tokens()
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *(
+                f'{field}_normalized' for field in ('username', 'email')
+                if field in update_fields
+            ), *(
+                ('auth_version', 'auth_revoked_at') if revoke else ()
+            )}
+        super().save(*args, **kwargs)
+        self._saved_auth = self.auth_state()
+
+    def revoke_tokens(self):
+        # Без сохранения: вызывающий код сохраняет вместе с остальными
+        # изменениями.
+        self.auth_version += 1
+        self.auth_revoked_at = timezone.now()
+
+    def soft_delete(self):
+        # Отзывы и комментарии удаляет purge_deleted небольшими пачками.
+        # Токены отзываются и у уже неактивного пользователя.
+        self.deleted_at = timezone.now()
+        self.is_active = False
+        self.revoke_tokens()
+        self.save(update_fields=(
+            'deleted_at', 'is_active', 'auth_version', 'auth_revoked_at'
+        ))
+
     @property
     def is_moderator(self):
         return self.role == MODERATOR
@@ -85,6 +230,9 @@ class CategoryAndGenre(models.Model):
         max_length=SLUG_MAX_LENGTH,
         verbose_name='Идентификатор'
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения', auto_now=True, db_index=True
+    )
 
     class Meta:
         abstract = True
@@ -135,21 +283,68 @@ class Title(models.Model):
         related_name='titles',
         through='GenreAndTitle',
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        null=True,
+        blank=True,
+    )
+    score_1 = models.PositiveIntegerField('Оценок «1»', default=0)
+    score_2 = models.PositiveIntegerField('Оценок «2»', default=0)
+    score_3 = models.PositiveIntegerField('Оценок «3»', default=0)
+    score_4 = models.PositiveIntegerField('Оценок «4»', default=0)
+    score_5 = models.PositiveIntegerField('Оценок «5»', default=0)
+    score_6 = models.PositiveIntegerField('Оценок «6»', default=0)
+    score_7 = models.PositiveIntegerField('Оценок «7»', default=0)
+    score_8 = models.PositiveIntegerField('Оценок «8»', default=0)
+    score_9 = models.PositiveIntegerField('Оценок «9»', default=0)
+    score_10 = models.PositiveIntegerField('Оценок «10»', default=0)
+    updated_at = models.DateTimeField(
+        'Дата изменения', auto_now=True, db_index=True
+    )
+    deleted_at = models.DateTimeField('Дата удаления', null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ('name',)
+        indexes = [
+            models.Index(
+                fields=('-year', 'name', 'id'), name='title_year_name_idx'
+            ),
+            models.Index(
+                fields=('deleted_at',), name='title_deleted_idx',
+                condition=models.Q(deleted_at__isnull=False)
+            ),
+        ]
         verbose_name = 'Название произведения',
         verbose_name_plural = 'Названия произведений'
 
     def __str__(self):
         return self.name
 
+    def soft_delete(self):
+        # Отзывы и комментарии удаляет purge_deleted небольшими пачками.
+        self.deleted_at = timezone.now()
+        self.save(update_fields=('deleted_at', 'updated_at'))
+
 
 class GenreAndTitle(models.Model):
     genre = models.ForeignKey(Genre, on_delete=models.SET_NULL, null=True)
     title = models.ForeignKey(Title, on_delete=models.CASCADE)
 
     class Meta:
+        indexes = [
+            models.Index(fields=('title', 'genre'), name='genre_title_idx'),
+        ]
         verbose_name = 'Жанр и название',
         verbose_name_plural = 'Жанры и названия'
 
@@ -168,22 +363,36 @@ class Review(models.Model):
         verbose_name="Оценка",
         validators=[
             MinValueValidator(
-                1, message='Убедитесь, что введенное число больше или равно 1'
+                MIN_SCORE, message=(
+                    'Убедитесь, что введенное число больше или равно '
+                    f'{MIN_SCORE}'
+                )
             ),
             MaxValueValidator(
-                10, message=(
-                    'Убедитесь, что введенное число меньше или равно 10'
+                MAX_SCORE, message=(
+                    'Убедитесь, что введенное число меньше или равно '
+                    f'{MAX_SCORE}'
                 )
             )
         ],
     )
     text = models.TextField("Текст", help_text="Отзыв")
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0
+    )
     pub_date = models.DateTimeField(
         'Дата публикации', auto_now_add=True, db_index=True
     )
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
 
     class Meta:
         ordering = ["-pub_date"]
+        indexes = [
+            models.Index(
+                fields=('title', '-pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["author", "title"], name="unique_review"
@@ -192,6 +401,11 @@ class Review(models.Model):
         verbose_name = 'Отзыв',
         verbose_name_plural = 'Отзывы'
 
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения обновляется в post_save, в той же транзакции.
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return '"{}" - отзыв на "{}" Автор: "{}"'.format(
             self.text,
@@ -211,15 +425,70 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         'Дата публикации', auto_now_add=True, db_index=True
     )
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
 
     class Meta:
         ordering = ["-pub_date"]
+        indexes = [
+            models.Index(
+                fields=('review', '-pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
         verbose_name = 'Комментарий',
         verbose_name_plural = 'Комментарии'
 
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        # comments_count отзыва обновляется в сигналах, в той же транзакции.
+        super().save(*args, **kwargs)
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        return super().delete(*args, **kwargs)
+
     def __str__(self):
         return '{} - комментарий на данный отзыв: {} Автор: {}'.format(
             self.text,
             self.review,
             self.author
         )
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди: пишется в транзакции запроса, отправляет воркер."""
+
+    subject = models.CharField('Тема', max_length=NAME_MAX_LENGTH)
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=EMAIL_MAX_LENGTH)
+    to = models.EmailField('Получатель', max_length=EMAIL_MAX_LENGTH)
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    send_after = models.DateTimeField('Отправить после', default=timezone.now)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+    # Метка воркера, забравшего письмо: см. reviews.outbox.claim.
+    lease = models.CharField(
+        'Аренда', max_length=32, blank=True, editable=False
+    )
+
+    class Meta:
+        ordering = ('send_after',)
+        indexes = [
+            models.Index(
+                fields=('send_after',), name='email_pending_idx',
+                condition=models.Q(sent_at__isnull=True)
+            ),
+            models.Index(
+                fields=('to', 'created_at'), name='email_to_created_idx'
+            ),
+            models.Index(
+                fields=('lease',), name='email_lease_idx',
+                condition=models.Q(sent_at__isnull=True)
+            ),
+        ]
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Очередь писем'
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
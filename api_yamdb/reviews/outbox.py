@@ -0,0 +1,121 @@
+import datetime
+import smtplib
+import uuid
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+
+SEND_ERRORS = (smtplib.SMTPException, OSError)
+
+
+def enqueue_email(subject, message, from_email, recipient):
+    """Ставит письмо в очередь в текущей транзакции."""
+    email = OutgoingEmail.objects.create(
+        subject=subject, body=message, from_email=from_email, to=recipient
+    )
+    if settings.EMAIL_OUTBOX_EAGER:
+        # Через claim, как воркер: иначе запущенный deliver_emails мог бы
+        # отправить это же письмо.
+        transaction.on_commit(lambda: deliver(claim([email.pk])))
+    return email
+
+
+def pending_emails(now=None):
+    return OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        send_after__lte=now or timezone.now(),
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    )
+
+
+def claim(pks):
+    """Забирает письма из pks, откладывая их на EMAIL_OUTBOX_LEASE секунд.
+
+    Забирает одним условным UPDATE с меткой аренды: строку, которую уже
+    отложил другой воркер, условие send_after <= now не пропустит. Так
+    работает и на SQLite, где select_for_update(skip_locked=True) молча
+    игнорируется. Если воркер упадёт посреди отправки, письма вернутся в
+    очередь после срока аренды.
+    """
+    lease = uuid.uuid4().hex
+    now = timezone.now()
+    pending_emails(now).filter(pk__in=pks).update(
+        lease=lease,
+        send_after=now + datetime.timedelta(
+            seconds=settings.EMAIL_OUTBOX_LEASE
+        ),
+    )
+    return list(OutgoingEmail.objects.filter(
+        lease=lease, sent_at__isnull=True
+    ))
+
+
+def claim_batch(batch_size):
+    """Забирает пачку из начала очереди; см. claim."""
+    return claim(list(
+        pending_emails().values_list('pk', flat=True)[:batch_size]
+    ))
+
+
+def retry_delay(attempts):
+    return datetime.timedelta(
+        seconds=settings.EMAIL_OUTBOX_BACKOFF * 2 ** (attempts - 1)
+    )
+
+
+def deliver(emails):
+    """Отправляет письма через одно соединение; возвращает (sent, failed).
+
+    Неотправленные письма откладываются с экспоненциальной паузой.
+    """
+    sent, errors = [], {}
+    try:
+        with get_connection() as connection:
+            for email in emails:
+                try:
+                    connection.send_messages([EmailMessage(
+                        email.subject, email.body, email.from_email,
+                        [email.to]
+                    )])
+                except SEND_ERRORS as error:
+                    errors[email.pk] = repr(error)
+                else:
+                    sent.append(email.pk)
+    except SEND_ERRORS as error:
+        # Соединение не открылось или оборвалось: повторим остаток пачки.
+        for email in emails:
+            if email.pk not in sent:
+                errors.setdefault(email.pk, repr(error))
+    now = timezone.now()
+    OutgoingEmail.objects.filter(pk__in=sent).update(
+        sent_at=now, attempts=F('attempts') + 1, last_error=''
+    )
+    for email in emails:
+        if email.pk in errors:
+            OutgoingEmail.objects.filter(pk=email.pk).update(
+                attempts=F('attempts') + 1,
+                send_after=now + retry_delay(email.attempts + 1),
+                last_error=errors[email.pk],
+            )
+    return len(sent), len(errors)
+
+
+def deliver_pending(batch_size):
+    """Отправляет очередь пачками; возвращает (отправлено, ошибок).
+
+    Останавливается, когда забирать нечего: в том числе если всю пачку
+    перехватил другой воркер.
+    """
+    total_sent = total_failed = 0
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            return total_sent, total_failed
+        sent, failed = deliver(emails)
+        total_sent += sent
+        total_failed += failed
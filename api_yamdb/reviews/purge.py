@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.models import Comment, Review, Title, User
+
+
+def dependent_querysets(obj):
+    """Зависимые строки объекта в порядке удаления, от самых глубоких."""
+    if isinstance(obj, Title):
+        return (
+            ('comments', Comment.objects.filter(review__title=obj)),
+            ('reviews', Review.objects.filter(title=obj)),
+        )
+    return (
+        ('comments', Comment.objects.filter(review__author=obj)),
+        ('comments', Comment.objects.filter(author=obj)),
+        ('reviews', Review.objects.filter(author=obj)),
+    )
+
+
+def delete_in_batches(queryset, batch_size, pause=0):
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return
+        # Короткая транзакция на пачку: блокировка записи SQLite
+        # освобождается между пачками.
+        with transaction.atomic():
+            queryset.model.objects.filter(pk__in=pks).delete()
+        yield len(pks)
+        if pause:
+            time.sleep(pause)
+
+
+def tokens_expired(obj):
+    # Строка пользователя хранит версию авторизации, по которой процессы
+    # отклоняют его токены, поэтому живёт, пока токены не истекут.
+    if not isinstance(obj, User):
+        return True
+    lifetime = settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+    return obj.deleted_at <= timezone.now() - lifetime
+
+
+def purge_deleted(batch_size, pause=0):
+    """Окончательно удаляет мягко удалённые произведения и пользователей.
+
+    Генератор: после каждой пачки отдаёт (объект, имя зависимых строк,
+    сколько удалено), после удаления самого объекта - (объект, None, 1).
+    Пользователь удаляется, когда истекли его токены доступа, отзывы и
+    комментарии - сразу.
+    """
+    for model in (Title, User):
+        deleted = model.all_objects.filter(deleted_at__isnull=False)
+        pks = list(deleted.order_by('deleted_at').values_list('pk', flat=True))
+        for obj in deleted.filter(pk__in=pks).order_by('deleted_at'):
+            for name, queryset in dependent_querysets(obj):
+                for count in delete_in_batches(queryset, batch_size, pause):
+                    yield obj, name, count
+            if not tokens_expired(obj):
+                continue
+            with transaction.atomic():
+                obj.delete()
+            yield obj, None, 1
@@ -0,0 +1,119 @@
+import re
+
+from django.db import OperationalError, connections
+from django.db.models import Q
+
+from reviews.models import Title
+
+TITLE_TABLE = Title._meta.db_table
+TITLE_SEARCH_TABLE = f'{TITLE_TABLE}_fts'
+
+TITLE_SEARCH_TABLE_SQL = f'''
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_SEARCH_TABLE} USING fts5(
+        name, description,
+        content='{TITLE_TABLE}', content_rowid='id', tokenize='unicode61'
+    )
+'''
+TITLE_SEARCH_TRIGGERS = {
+    f'{TITLE_SEARCH_TABLE}_insert': f'''
+        CREATE TRIGGER {TITLE_SEARCH_TABLE}_insert
+        AFTER INSERT ON {TITLE_TABLE} BEGIN
+            INSERT INTO {TITLE_SEARCH_TABLE} (rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    ''',
+    f'{TITLE_SEARCH_TABLE}_delete': f'''
+        CREATE TRIGGER {TITLE_SEARCH_TABLE}_delete
+        AFTER DELETE ON {TITLE_TABLE} BEGIN
+            INSERT INTO {TITLE_SEARCH_TABLE}
+                ({TITLE_SEARCH_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+    ''',
+    f'{TITLE_SEARCH_TABLE}_update': f'''
+        CREATE TRIGGER {TITLE_SEARCH_TABLE}_update
+        AFTER UPDATE OF name, description ON {TITLE_TABLE} BEGIN
+            INSERT INTO {TITLE_SEARCH_TABLE}
+                ({TITLE_SEARCH_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO {TITLE_SEARCH_TABLE} (rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    ''',
+}
+
+# Вес совпадений в названии относительно описания для bm25().
+TITLE_SEARCH_WEIGHTS = (10.0, 1.0)
+
+_search_available = {}
+
+
+def install_title_search(using='default'):
+    """Создаёт FTS5-индекс произведений и триггеры синхронизации.
+
+    Вызывается после каждой миграции: SQLite пересоздаёт таблицу при
+    изменении схемы и теряет её триггеры, поэтому недостающие триггеры
+    создаются заново, а индекс перестраивается.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    if TITLE_TABLE not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(TITLE_SEARCH_TABLE_SQL)
+        except OperationalError:
+            # SQLite собран без FTS5: остаётся поиск через icontains.
+            _search_available[using] = False
+            return
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            f"AND tbl_name = '{TITLE_TABLE}'"
+        )
+        existing = {name for name, in cursor.fetchall()}
+        missing = set(TITLE_SEARCH_TRIGGERS) - existing
+        for name in missing:
+            cursor.execute(TITLE_SEARCH_TRIGGERS[name])
+        if missing:
+            cursor.execute(
+                f"INSERT INTO {TITLE_SEARCH_TABLE} ({TITLE_SEARCH_TABLE}) "
+                "VALUES ('rebuild')"
+            )
+    _search_available[using] = True
+
+
+def title_search_available(using='default'):
+    if using not in _search_available:
+        connection = connections[using]
+        _search_available[using] = (
+            connection.vendor == 'sqlite'
+            and TITLE_SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _search_available[using]
+
+
+def build_match_query(value):
+    words = re.findall(r'\w+', value)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+
+def search_titles(queryset, value):
+    match = build_match_query(value)
+    if match is None or not title_search_available(queryset.db):
+        return queryset.filter(
+            Q(name__icontains=value) | Q(description__icontains=value)
+        )
+    return queryset.extra(
+        select={'search_rank': 'bm25({}, {}, {})'.format(
+            TITLE_SEARCH_TABLE, *TITLE_SEARCH_WEIGHTS
+        )},
+        tables=[TITLE_SEARCH_TABLE],
+        where=[
+            f'{TITLE_SEARCH_TABLE}.rowid = {TITLE_TABLE}.id',
+            f'{TITLE_SEARCH_TABLE} MATCH %s',
+        ],
+        params=[match],
+    ).order_by('search_rank', 'id')
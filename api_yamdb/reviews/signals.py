@@ -0,0 +1,98 @@
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_migrate, post_save, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.aggregates import update_comments_count, update_title_scores
+from reviews.cache import bump_generation
+from reviews.models import (
+    Category, Comment, Genre, GenreAndTitle, Review, Title
+)
+from reviews.search import install_title_search
+
+CATALOG_MODELS = (Category, Genre, GenreAndTitle, Review, Title)
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    instance._saved_score = None
+    if instance.pk is not None:
+        instance._saved_score = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def add_review_score(sender, instance, **kwargs):
+    saved_score = getattr(instance, '_saved_score', None)
+    if saved_score is None:
+        update_title_scores(instance.title_id, added=instance.score)
+        return
+    title_id, score = saved_score
+    if title_id == instance.title_id:
+        update_title_scores(title_id, added=instance.score, removed=score)
+        return
+    update_title_scores(title_id, removed=score)
+    update_title_scores(instance.title_id, added=instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score(sender, instance, **kwargs):
+    update_title_scores(instance.title_id, removed=instance.score)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_review(sender, instance, **kwargs):
+    instance._saved_review_id = None
+    if instance.pk is not None:
+        instance._saved_review_id = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('review_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def add_review_comment(sender, instance, **kwargs):
+    saved_review_id = getattr(instance, '_saved_review_id', None)
+    if saved_review_id == instance.review_id:
+        return
+    if saved_review_id is not None:
+        update_comments_count(saved_review_id, -1)
+    update_comments_count(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def remove_review_comment(sender, instance, **kwargs):
+    update_comments_count(instance.review_id, -1)
+
+
+def bump_catalog_generation(sender, **kwargs):
+    bump_generation(sender)
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(bump_catalog_generation, sender=model)
+    post_delete.connect(bump_catalog_generation, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    # Для genre.titles.clear() список произведений известен только до
+    # очистки, для остальных действий - после.
+    clear_action = 'pre_clear' if reverse else 'post_clear'
+    if action not in ('post_add', 'post_remove', clear_action):
+        return
+    if not reverse:
+        titles = Title.objects.filter(pk=instance.pk)
+    elif pk_set is None:
+        titles = Title.objects.filter(genre=instance)
+    else:
+        titles = Title.objects.filter(pk__in=pk_set)
+    titles.update(updated_at=timezone.now())
+    bump_generation(GenreAndTitle)
+
+
+@receiver(post_migrate)
+def install_title_search_index(sender, using, **kwargs):
+    if sender.name == 'reviews':
+        install_title_search(using)
@@ -0,0 +1,139 @@
+import datetime
+import sqlite3
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail, User
+from reviews.outbox import enqueue_email
+
+CREATED = 'created'
+EXISTING = 'existing'
+CONFLICT = 'conflict'
+# Повторная регистрация: письмо с кодом поставлено в очередь заново или
+# уже ждёт в ней (отправлено недавно).
+RESENT = 'resent'
+REUSED = 'reused'
+
+SIGNUP_SUBJECT = 'Завершение регистрации'
+SIGNUP_FROM_EMAIL = 'webmaster@localhost'
+SIGNUP_MESSAGE = (
+    'Ваш код: {code}\n'
+    'Перейдите по адресу '
+    'http://127.0.0.1:8000/api/v1/auth/token/ и введите его '
+    'вместе со своим username'
+)
+
+
+def upsert_supported():
+    # Несколько ON CONFLICT в одном INSERT есть только в SQLite 3.35+;
+    # в PostgreSQL допустим один, поэтому остальные БД идут через
+    # get_or_create_user.
+    return connection.vendor == 'sqlite' and (
+        sqlite3.sqlite_version_info >= (3, 35, 0)
+    )
+
+
+def upsert_sql(fields):
+    quote = connection.ops.quote_name
+    table = quote(User._meta.db_table)
+    username, email = quote('username'), quote('email')
+    # Пустой DO UPDATE нужен ради RETURNING существующей строки: с
+    # DO NOTHING при конфликте строка не вернулась бы. Несколько ON
+    # CONFLICT в одном INSERT поддерживает SQLite 3.35+. deleted_at
+    # возвращается как есть: выражение IS NULL в RETURNING SQLite 3.40
+    # вычисляет неверно (0 для NULL).
+    return f'''
+        INSERT INTO {table} ({', '.join(quote(f.column) for f in fields)})
+        VALUES ({', '.join(['%s'] * len(fields))})
+        ON CONFLICT ({username}) DO UPDATE SET {username} = {username}
+        ON CONFLICT ({email}) DO UPDATE SET {email} = {email}
+        RETURNING {quote('id')}, {username}, {email}, {quote('deleted_at')},
+            {quote('password')} = %s
+    '''
+
+
+def upsert_user(user):
+    """Вставляет пользователя одним запросом; возвращает (статус, id).
+
+    Если username или email заняты, тот же запрос возвращает занявшую их
+    строку: EXISTING, если это тот же живой пользователь, иначе CONFLICT.
+    """
+    fields = [
+        field for field in User._meta.concrete_fields
+        if not field.primary_key
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(upsert_sql(fields), [
+            field.get_db_prep_save(getattr(user, field.attname), connection)
+            for field in fields
+        ] + [user.password])
+        pk, username, email, deleted_at, inserted = cursor.fetchone()
+    if inserted:
+        user.pk = pk
+        return CREATED, pk
+    if deleted_at is None and (username, email) == (
+        user.username, user.email
+    ):
+        return EXISTING, pk
+    return CONFLICT, pk
+
+
+def get_or_create_user(user):
+    """Прежний путь через get_or_create; статусы те же, что у upsert_user."""
+    try:
+        with transaction.atomic():
+            existing, created = User.objects.get_or_create(
+                username=user.username, email=user.email,
+                defaults={'password': user.password}
+            )
+    except IntegrityError:
+        # Пара занята частично или удалённым пользователем.
+        return CONFLICT, None
+    if not created:
+        return EXISTING, existing.pk
+    user.pk = existing.pk
+    return CREATED, existing.pk
+
+
+def confirmation_pending(email):
+    return OutgoingEmail.objects.filter(
+        to=email, subject=SIGNUP_SUBJECT,
+        created_at__gte=timezone.now() - datetime.timedelta(
+            seconds=settings.SIGNUP_CONFIRMATION_WINDOW
+        )
+    ).exists()
+
+
+def signup(username, email):
+    """Регистрирует пользователя и ставит в очередь письмо с кодом.
+
+    Возвращает CREATED, RESENT, REUSED или CONFLICT. Повторная
+    регистрация в течение SIGNUP_CONFIRMATION_WINDOW секунд не выпускает
+    новый код: письмо с прежним уже в очереди или отправлено.
+    """
+    user = User(username=username, email=email)
+    # Случайный непригодный пароль: по нему upsert_user отличает
+    # вставленную строку от уже существовавшей.
+    user.set_unusable_password()
+    user.set_normalized()
+    insert_user = upsert_user if upsert_supported() else get_or_create_user
+    with transaction.atomic():
+        status, pk = insert_user(user)
+        if status == CONFLICT:
+            return CONFLICT
+        if status == EXISTING:
+            if confirmation_pending(email):
+                return REUSED
+            user = User.objects.get(pk=pk)
+        enqueue_email(
+            SIGNUP_SUBJECT,
+            SIGNUP_MESSAGE.format(
+                code=default_token_generator.make_token(user)
+            ),
+            SIGNUP_FROM_EMAIL,
+            email
+        )
+    return CREATED if status == CREATED else RESENT
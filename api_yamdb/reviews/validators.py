@@ -10,9 +10,15 @@ def validate_year(value):
         raise ValidationError('Год издания не может быть больше текущего года')
 
 
+# Пути /users/me/ и /users/bulk/ заняты действиями UserViewSet.
+RESERVED_USERNAMES = ('me', 'bulk')
+
+
 def validate_username(value):
-    if value.lower() == 'me':
-        raise ValidationError('"me" - Недопустимое имя пользователя.')
+    if value.lower() in RESERVED_USERNAMES:
+        raise ValidationError(
+            f'"{value.lower()}" - Недопустимое имя пользователя.'
+        )
 
     if re.search(r'^[a-zA-Z][a-zA-Z0-9-_\.]{1,20}$', value) is None:
         raise ValidationError(
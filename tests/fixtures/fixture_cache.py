@@ -0,0 +1,29 @@
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from api.authentication import auth_versions
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cache_dir(tmp_path_factory):
+    # Свой каталог кеша, чтобы не делить его с запущенными dev-серверами.
+    location = str(tmp_path_factory.mktemp('cache'))
+    caches = {'default': {**settings.CACHES['default'], 'LOCATION': location}}
+    with override_settings(CACHES=caches):
+        yield location
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_versions():
+    auth_versions.clear()
+    yield
+    auth_versions.clear()
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def eager_outbox(settings):
+    # Письма из очереди отправляются сразу после коммита, как будто
+    # deliver_emails уже отработал.
+    settings.EMAIL_OUTBOX_EAGER = True
@@ -0,0 +1,104 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def check_rating(self, title_id, rating_sum, rating_count, rating):
+        title = Title.objects.get(pk=title_id)
+        assert (
+            title.rating_sum, title.rating_count, title.rating
+        ) == (rating_sum, rating_count, rating), (
+            'Проверьте, что поля `rating_sum`, `rating_count` и `rating` '
+            'произведения обновляются при изменении отзывов.'
+        )
+
+    def test_01_rating_on_review_changes(self, admin_client, admin,
+                                         user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        self.check_rating(title_id, 10, 2, 5)
+
+        response = user_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/',
+            data={'score': 10}
+        )
+        assert response.status_code == 200
+        self.check_rating(title_id, 15, 2, 7)
+        assert admin_client.get(
+            f'/api/v1/titles/{title_id}/'
+        ).json()['rating'] == 7, (
+            'Проверьте, что поле `rating` в ответе на GET-запрос к '
+            '`/api/v1/titles/{title_id}/` берётся из сохранённого рейтинга.'
+        )
+
+        response = admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+        )
+        assert response.status_code == 204
+        self.check_rating(title_id, 10, 1, 10)
+
+    def test_02_rating_on_user_delete(self, admin_client, admin,
+                                      user_client, user):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        create_single_review(user_client, titles[1]['id'], 'text', 1)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        call_command('purge_deleted', stdout=StringIO())
+        self.check_rating(titles[0]['id'], 5, 1, 5)
+        self.check_rating(titles[1]['id'], 0, 0, None)
+
+    def test_03_recalculate_ratings_command(self, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        Title.objects.update(rating_sum=100, rating_count=3, rating=33)
+
+        call_command('recalculate_ratings', stdout=StringIO())
+        self.check_rating(titles[0]['id'], 5, 1, 5)
+        self.check_rating(titles[1]['id'], 0, 0, None)
+
+    def test_04_score_distribution(self, client, admin_client, admin,
+                                   user_client, user, moderator_client,
+                                   moderator, django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {
+            admin: admin_client, user: user_client
+        })
+        title_id = titles[0]['id']
+        create_single_review(moderator_client, title_id, 'text', 9)
+        user_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/',
+            data={'score': 2}
+        )
+
+        url = f'/api/v1/titles/{title_id}/score-distribution/'
+        with django_assert_num_queries(1):
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что эндпоинт `{url}` доступен без авторизации.'
+        )
+        expected = {str(score): 0 for score in range(1, 11)}
+        expected.update({'2': 1, '5': 1, '9': 1})
+        assert response.json() == {
+            'id': title_id, 'rating': 5, 'count': 3,
+            'distribution': expected,
+        }, (
+            f'Проверьте, что `{url}` возвращает распределение оценок '
+            'произведения.'
+        )
+
+        Title.objects.update(score_2=0, score_9=7)
+        call_command('recalculate_ratings', stdout=StringIO())
+        assert client.get(url).json()['distribution'] == expected
+
+        response = client.get('/api/v1/titles/0/score-distribution/')
+        assert response.status_code == 404
@@ -0,0 +1,46 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+# ETag считается по самому ответу и запросов не добавляет.
+TITLE_LIST_QUERIES = 3
+TITLE_DETAIL_QUERIES = 2
+
+
+def create_titles_bulk(count):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Ужасы', slug='horror'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    titles = []
+    for idx in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryBudget:
+
+    @pytest.mark.parametrize('titles_count', (1, 3, 5, 12))
+    def test_01_title_list_queries(self, client, django_assert_num_queries,
+                                   titles_count):
+        create_titles_bulk(titles_count)
+        with django_assert_num_queries(TITLE_LIST_QUERIES):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert len(response.json()['results']) == min(titles_count, 5), (
+            'Проверьте, что для эндпоинта `/api/v1/titles/` настроена '
+            'пагинация.'
+        )
+
+    def test_02_title_detail_queries(self, client, django_assert_num_queries):
+        title = create_titles_bulk(1)[0]
+        with django_assert_num_queries(TITLE_DETAIL_QUERIES):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+        assert len(response.json()['genre']) == 2
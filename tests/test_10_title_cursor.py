@@ -0,0 +1,82 @@
+import pytest
+
+from reviews.models import Title
+from tests.utils import make_cursor
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleCursorPagination:
+    url = '/api/v1/titles/'
+
+    def create_titles(self):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx:02}', year=1990 + idx % 3)
+            for idx in range(12)
+        )
+        return list(
+            Title.objects.order_by('-year', 'name', 'id').values_list(
+                'id', flat=True
+            )
+        )
+
+    def test_01_cursor_walks_all_titles(self, client):
+        expected = self.create_titles()
+        response = client.get(self.url, {'cursor': ''})
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            f'Проверьте, что keyset-пагинация `{self.url}?cursor=` не '
+            'выполняет подсчёт количества объектов.'
+        )
+        assert data['previous'] is None
+
+        seen = [title['id'] for title in data['results']]
+        pages = [data]
+        while data['next']:
+            data = client.get(data['next']).json()
+            pages.append(data)
+            seen.extend(title['id'] for title in data['results'])
+        assert seen == expected, (
+            f'Проверьте, что keyset-пагинация `{self.url}` возвращает все '
+            'произведения в порядке (-year, name) без повторов.'
+        )
+
+        previous = client.get(pages[-1]['previous']).json()
+        assert previous['results'] == pages[-2]['results'], (
+            'Проверьте, что ссылка `previous` keyset-пагинации возвращает '
+            'предыдущую страницу.'
+        )
+
+    def test_02_page_number_still_works(self, client):
+        self.create_titles()
+        data = client.get(self.url, {'page': 2}).json()
+        assert data['count'] == 12
+        assert len(data['results']) == 5
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get(self.url, {'cursor': 'broken'})
+        assert response.status_code == 404
+
+    def test_04_tampered_cursor(self, client):
+        self.create_titles()
+        for position in (
+            ['abc', 'x', 1], [None, None, None], [[1990], ['x'], [1]],
+            [1990, 'x', 2 ** 70], [1990, 'x'], {'year': 1990},
+        ):
+            response = client.get(self.url, {'cursor': make_cursor(position)})
+            assert response.status_code == 404, (
+                f'Проверьте, что курсор с позицией {position} отклоняется '
+                'ответом 404, а не ошибкой сервера.'
+            )
+        response = client.get(
+            self.url, {'cursor': make_cursor([1991, 'Произведение 01', 1])}
+        )
+        assert response.status_code == 200
+
+    def test_05_cursor_with_ordering(self, client):
+        response = client.get(self.url, {'cursor': '', 'ordering': 'name'})
+        assert response.status_code == 400, (
+            'Проверьте, что `?ordering=` вместе с `?cursor=` отклоняется, '
+            'а не игнорируется молча.'
+        )
+        assert 'ordering' in response.json()
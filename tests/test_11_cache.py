@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.conftest import MANAGE_PATH
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    def test_01_cached_list_skips_database(self, client, admin_client,
+                                           django_assert_num_queries):
+        create_titles(admin_client)
+        for url in ('/api/v1/titles/', '/api/v1/genres/',
+                    '/api/v1/categories/'):
+            first = client.get(url)
+            with django_assert_num_queries(0):
+                second = client.get(url)
+            assert second.json() == first.json(), (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                'возвращает закешированный ответ.'
+            )
+
+    def test_02_query_params_in_key(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        data = client.get('/api/v1/titles/', {'year': 1984}).json()
+        assert [title['id'] for title in data['results']] == [
+            titles[0]['id']
+        ]
+
+    def test_03_writes_invalidate(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+
+        create_single_review(admin_client, titles[0]['id'], 'text', 8)
+        assert client.get(url).json()['rating'] == 8, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведения.'
+        )
+
+        admin_client.patch(url, data={'genre': [genres[2]['slug']]})
+        assert client.get(url).json()['genre'] == [genres[2]], (
+            'Проверьте, что изменение жанров сбрасывает кеш произведения.'
+        )
+
+        genres_count = client.get('/api/v1/genres/').json()['count']
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        assert client.get(
+            '/api/v1/genres/'
+        ).json()['count'] == genres_count - 1, (
+            'Проверьте, что удаление жанра сбрасывает кеш списка жанров.'
+        )
+
+    def test_04_other_process_invalidates(self, client, admin_client,
+                                          cache_dir):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        client.get(url)
+        # Команды manage.py работают в отдельном процессе: сброшенное ими
+        # поколение должно быть видно веб-процессу.
+        subprocess.run([
+            sys.executable, '-c',
+            'import django; django.setup(); '
+            'from reviews.cache import increment_generation; '
+            'from reviews.models import Title; '
+            'increment_generation(Title)',
+        ], cwd=MANAGE_PATH, check=True, env={
+            **os.environ, 'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings',
+            'CACHE_DIR': cache_dir,
+        })
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        assert context.captured_queries, (
+            'Проверьте, что кеш общий для процессов: сброс поколения из '
+            'другого процесса должен сбрасывать закешированный ответ.'
+        )
+
+    def test_05_own_cache_dir(self, cache_dir):
+        cache.set('test_11_key', 1)
+        assert os.listdir(cache_dir), (
+            'Проверьте, что тесты пишут кеш в свой каталог `CACHE_DIR`.'
+        )
@@ -0,0 +1,51 @@
+import pytest
+
+from reviews.models import Title
+from reviews.search import title_search_available
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+    url = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.url, {'search': query})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_index_installed(self):
+        assert title_search_available(), (
+            'Проверьте, что после миграций создаётся FTS5-индекс '
+            'произведений.'
+        )
+
+    def test_02_search_name_and_description(self, client):
+        Title.objects.create(name='Крепкий орешек', year=1988)
+        Title.objects.create(
+            name='Терминатор', year=1984, description='Крепкий робот'
+        )
+        Title.objects.create(name='Чужой', year=1979)
+
+        assert self.search(client, 'крепкий') == [
+            'Крепкий орешек', 'Терминатор'
+        ], (
+            f'Проверьте, что `{self.url}?search=` ищет по названию и '
+            'описанию и ранжирует совпадения в названии выше.'
+        )
+        assert self.search(client, 'терм') == ['Терминатор'], (
+            f'Проверьте, что `{self.url}?search=` ищет по префиксу слова.'
+        )
+        assert self.search(client, '"(*') == []
+
+    def test_03_search_index_follows_writes(self, client):
+        title = Title.objects.create(name='Старое имя', year=2000)
+        title.name = 'Новое имя'
+        title.save()
+        assert self.search(client, 'старое') == []
+        assert self.search(client, 'новое') == ['Новое имя']
+
+        Title.objects.bulk_create([Title(name='Массовое', year=2001)])
+        assert self.search(client, 'массовое') == ['Массовое']
+
+        title.delete()
+        assert self.search(client, 'новое') == []
@@ -0,0 +1,58 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleFilters:
+    url = '/api/v1/titles/'
+
+    def filter_names(self, client, params):
+        response = client.get(self.url, params)
+        assert response.status_code == 200
+        data = response.json()
+        names = sorted(title['name'] for title in data['results'])
+        assert data['count'] == len(names), (
+            f'Проверьте, что фильтры `{self.url}` не дублируют произведения.'
+        )
+        return names
+
+    def test_01_genre_filter(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.filter_names(client, {'genre': 'horror'}) == [
+            'Терминатор'
+        ]
+        assert self.filter_names(client, {'genre': 'horr'}) == [], (
+            f'Проверьте, что фильтр `{self.url}?genre=` сравнивает slug '
+            'жанра точно.'
+        )
+        assert self.filter_names(client, {'genre': 'horror,comedy'}) == [
+            'Терминатор'
+        ]
+        assert self.filter_names(client, {'genre': 'comedy,drama'}) == [
+            'Крепкий орешек', 'Терминатор'
+        ]
+
+    def test_02_genre_mode_all(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.filter_names(
+            client, {'genre': 'horror,comedy', 'genre_mode': 'all'}
+        ) == ['Терминатор'], (
+            f'Проверьте, что `{self.url}?genre_mode=all` возвращает '
+            'произведения со всеми перечисленными жанрами.'
+        )
+        assert self.filter_names(
+            client, {'genre': 'horror,drama', 'genre_mode': 'all'}
+        ) == []
+        response = client.get(self.url, {'genre_mode': 'some'})
+        assert response.status_code == 400
+
+    def test_03_category_filter(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.filter_names(client, {'category': 'films'}) == [
+            'Терминатор'
+        ]
+        assert self.filter_names(client, {'category': 'film'}) == []
+        assert self.filter_names(client, {'category': 'films,books'}) == [
+            'Крепкий орешек', 'Терминатор'
+        ]
@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14SparseFields:
+
+    def get(self, client, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == 200
+        return response.json(), [query['sql'] for query in context]
+
+    def test_01_title_fields(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        data, queries = self.get(client, url, {'fields': 'id,name,rating'})
+        assert set(data['results'][0]) == {'id', 'name', 'rating'}, (
+            f'Проверьте, что `{url}?fields=` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert len(queries) == 2, (
+            f'Проверьте, что `{url}?fields=` не загружает жанры, если поле '
+            '`genre` не запрошено.'
+        )
+        assert not any('description' in sql for sql in queries), (
+            f'Проверьте, что `{url}?fields=` не загружает из БД '
+            'незапрошенные колонки.'
+        )
+
+        data, queries = self.get(
+            client, f'{url}{titles[0]["id"]}/',
+            {'omit': 'description,genre'}
+        )
+        assert set(data) == {'id', 'name', 'year', 'category', 'rating'}
+        assert data['category'] == {'name': 'Фильм', 'slug': 'films'}
+        assert len(queries) == 1
+        assert not any('description' in sql for sql in queries)
+
+    def test_02_unknown_field(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/', {'fields': 'id,secret'})
+        assert response.status_code == 400
+
+    def test_03_review_and_comment_fields(self, client, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data, queries = self.get(client, url, {'fields': 'id,score'})
+        assert data['results'] == [
+            {'id': review['id'], 'score': review['score']}
+            for review in reviews
+        ]
+        assert not any('"reviews_review"."text"' in sql for sql in queries)
+
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        data, queries = self.get(client, url, {'omit': 'text'})
+        assert data['results'][0]['author'] == admin.username
+        assert 'text' not in data['results'][0]
+        assert not any(
+            '"reviews_comment"."text"' in sql for sql in queries
+        )
@@ -0,0 +1,133 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.has_header('ETag'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        etag = response['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert response['ETag'] == etag
+        return etag
+
+    def test_01_titles(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        list_url = '/api/v1/titles/'
+        detail_url = f'{list_url}{titles[0]["id"]}/'
+        list_etag = self.check_not_modified(client, list_url)
+        detail_etag = self.check_not_modified(client, detail_url)
+
+        admin_client.patch(detail_url, data={'genre': [genres[2]['slug']]})
+        assert client.get(
+            detail_url, HTTP_IF_NONE_MATCH=detail_etag
+        ).status_code == 200
+        assert client.get(
+            list_url, HTTP_IF_NONE_MATCH=list_etag
+        ).status_code == 200
+
+    def test_02_no_last_modified(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(url)
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что `Last-Modified` не отдаётся: удаление не '
+            'сдвигает max(updated_at).'
+        )
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT'
+        )
+        assert response.status_code == 200
+
+    def test_03_reviews_and_comments(self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        for url in (reviews_url, f'{reviews_url}{reviews[0]["id"]}/',
+                    '/api/v1/genres/', '/api/v1/categories/'):
+            self.check_not_modified(client, url)
+        etag = self.check_not_modified(client, comments_url)
+
+        admin_client.post(comments_url, data={'text': 'ещё'})
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый комментарий меняет `ETag` списка '
+            'комментариев.'
+        )
+
+    def test_04_deletions(self, client, admin_client, admin, user,
+                          user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        titles_url = '/api/v1/titles/'
+        etags = {
+            url: self.check_not_modified(client, url)
+            for url in (reviews_url, comments_url, titles_url)
+        }
+        comment_id = client.get(comments_url).json()['results'][0]['id']
+        admin_client.delete(f'{comments_url}{comment_id}/')
+        admin_client.delete(f'{reviews_url}{reviews[-1]["id"]}/')
+        genre = titles[0]['genre'][0]
+        admin_client.delete(f'/api/v1/genres/{genre}/')
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                f'Проверьте, что удаление меняет `ETag` ответа `{url}`.'
+            )
+            response = client.get(
+                url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT'
+            )
+            assert response.status_code == 200, (
+                f'Проверьте, что `If-Modified-Since` не отдаёт 304 для '
+                f'`{url}` после удаления.'
+            )
+
+    def test_05_author_rename(self, client, admin_client, user, user_client):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = self.check_not_modified(client, url)
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что смена username автора меняет `ETag` списка '
+            'отзывов.'
+        )
+        assert response.json()['results'][0]['author'] == 'renamed'
+
+    def test_06_no_aggregates(self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url in (reviews_url, f'{reviews_url}{reviews[0]["id"]}/comments/',
+                    '/api/v1/titles/'):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url, {'cursor': ''})
+            assert response.status_code == 200 and response['ETag']
+            assert not any(
+                'MAX(' in query['sql'] or 'COUNT(' in query['sql']
+                for query in context.captured_queries
+            ), (
+                f'Проверьте, что `ETag` для `{url}?cursor=` считается по '
+                'полученной странице, без агрегатов по всей выборке.'
+            )
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleBulkCreate:
+    url = '/api/v1/titles/bulk/'
+
+    def title_data(self, idx, genre=('horror', 'comedy'), category='films'):
+        return {
+            'name': f'Произведение {idx}',
+            'year': 2000,
+            'genre': list(genre),
+            'category': category,
+        }
+
+    def test_01_bulk_create(self, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        data = [self.title_data(idx) for idx in range(3)]
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == 201, (
+            f'Проверьте, что POST-запрос администратора к `{self.url}` с '
+            'корректными данными возвращает ответ со статусом 201.'
+        )
+        results = response.json()
+        assert [item['name'] for item in results] == [
+            item['name'] for item in data
+        ]
+        for item in results:
+            title = Title.objects.get(pk=item['id'])
+            assert title.category.slug == 'films'
+            assert sorted(title.genre.values_list('slug', flat=True)) == [
+                'comedy', 'horror'
+            ], (
+                f'Проверьте, что `{self.url}` сохраняет жанры произведений.'
+            )
+
+    def test_02_per_item_errors(self, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        data = [
+            self.title_data(0),
+            self.title_data(1, genre=('horror', 'unknown')),
+            {**self.title_data(2), 'year': 3000},
+            self.title_data(3, category='unknown'),
+        ]
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == 207
+        results = response.json()
+        assert 'id' in results[0]
+        assert list(results[1]['errors']) == ['genre']
+        assert list(results[2]['errors']) == ['year']
+        assert list(results[3]['errors']) == ['category']
+        assert Title.objects.count() == 1
+
+        response = admin_client.post(self.url, data=data[1:], format='json')
+        assert response.status_code == 400
+
+    def test_03_constant_queries(self, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        counts = []
+        for size in (1, 20):
+            data = [self.title_data(idx) for idx in range(size)]
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    self.url, data=data, format='json'
+                )
+            assert response.status_code == 201
+            counts.append(len(context))
+        assert counts[0] == counts[1], (
+            f'Проверьте, что число запросов `{self.url}` не зависит от '
+            'количества произведений.'
+        )
+
+    def test_04_permissions(self, client, user_client):
+        data = [self.title_data(0)]
+        assert client.post(
+            self.url, data=json.dumps(data), content_type='application/json'
+        ).status_code == 401
+        assert user_client.post(
+            self.url, data=data, format='json'
+        ).status_code == 403
@@ -0,0 +1,55 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_review
+
+
+def select_count(queries, table):
+    pattern = re.compile(rf'^SELECT .* FROM "{table}"')
+    return sum(1 for query in queries if pattern.match(query['sql']))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17NestedRoutes:
+
+    def test_01_comment_review_from_other_title(self, client, admin_client,
+                                                admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        assert client.get(url).status_code == 404, (
+            'Проверьте, что GET-запрос к '
+            '`/api/v1/titles/{title_id}/reviews/{review_id}/comments/` '
+            'возвращает 404, если отзыв относится к другому произведению.'
+        )
+        response = admin_client.post(url, data={'text': 'text'})
+        assert response.status_code == 404
+
+    def test_02_parents_resolved_once(self, client, admin_client, admin,
+                                      user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            create_single_review(user_client, titles[1]['id'], 'text', 3)
+        assert select_count(context, 'reviews_title') == 1, (
+            f'Проверьте, что POST-запрос к `{reviews_url}` получает '
+            'произведение одним запросом.'
+        )
+
+        comments_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        with CaptureQueriesContext(connection) as context:
+            client.get(comments_url)
+        assert select_count(context, 'reviews_review') == 1
+        assert select_count(context, 'reviews_title') == 0
@@ -0,0 +1,120 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from reviews.models import Comment, Review, Title
+from tests.utils import make_cursor
+
+User = get_user_model()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ReviewCursorPagination:
+
+    def create_reviews(self):
+        title = Title.objects.create(name='Произведение', year=2000)
+        authors = [
+            User.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(12)
+        ]
+        Review.objects.bulk_create(
+            Review(author=author, title=title, text='text', score=5)
+            for author in authors
+        )
+        # Одинаковые даты проверяют разбор «ничьих» по id.
+        pub_date = timezone.now().replace(microsecond=123456)
+        Review.objects.filter(author__in=authors[:6]).update(
+            pub_date=pub_date
+        )
+        review = Review.objects.order_by('id').first()
+        Comment.objects.bulk_create(
+            Comment(author=author, review=review, text='text')
+            for author in authors
+        )
+        Comment.objects.filter(author__in=authors[3:9]).update(
+            pub_date=pub_date
+        )
+        return title, review
+
+    def walk(self, client, url, params):
+        response = client.get(url, params)
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            f'Проверьте, что keyset-пагинация `{url}?cursor=` не выполняет '
+            'подсчёт количества объектов.'
+        )
+        pages = [data]
+        while data['next']:
+            data = client.get(data['next']).json()
+            pages.append(data)
+        previous = client.get(pages[-1]['previous']).json()
+        assert previous['results'] == pages[-2]['results'], (
+            'Проверьте, что ссылка `previous` keyset-пагинации возвращает '
+            'предыдущую страницу.'
+        )
+        return [item['id'] for page in pages for item in page['results']]
+
+    def test_01_review_cursor(self, client):
+        title, _ = self.create_reviews()
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        expected = list(Review.objects.filter(title=title).order_by(
+            '-pub_date', 'id'
+        ).values_list('id', flat=True))
+        assert self.walk(client, url, {'cursor': ''}) == expected, (
+            f'Проверьте, что keyset-пагинация `{url}` возвращает все отзывы '
+            'в порядке (-pub_date, id) без повторов и пропусков.'
+        )
+        assert self.walk(
+            client, url, {'cursor': '', 'fields': 'id'}
+        ) == expected
+
+    def test_02_comment_cursor(self, client):
+        title, review = self.create_reviews()
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        expected = list(review.comments.order_by(
+            '-pub_date', 'id'
+        ).values_list('id', flat=True))
+        assert self.walk(client, url, {'cursor': ''}) == expected, (
+            f'Проверьте, что keyset-пагинация `{url}` возвращает все '
+            'комментарии в порядке (-pub_date, id) без повторов и пропусков.'
+        )
+
+    def test_03_page_number_still_works(self, client):
+        title, _ = self.create_reviews()
+        data = client.get(
+            f'/api/v1/titles/{title.id}/reviews/', {'page': 2}
+        ).json()
+        assert data['count'] == 12
+
+    def test_04_sparse_fields_do_not_refetch(self, client,
+                                             django_assert_max_num_queries):
+        title, _ = self.create_reviews()
+        with django_assert_max_num_queries(4):
+            response = client.get(
+                f'/api/v1/titles/{title.id}/reviews/',
+                {'cursor': '', 'fields': 'id'}
+            )
+        assert response.status_code == 200
+
+    def test_05_tampered_cursor(self, client):
+        title, review = self.create_reviews()
+        for url in (
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        ):
+            for position in (
+                ['zzz', 1], [None, None], [['2020-01-01T00:00:00'], 1],
+                [timezone.now().isoformat(), 'x'],
+            ):
+                response = client.get(url, {'cursor': make_cursor(position)})
+                assert response.status_code == 404, (
+                    f'Проверьте, что `{url}` отклоняет курсор с позицией '
+                    f'{position} ответом 404.'
+                )
+            response = client.get(
+                url, {'cursor': make_cursor([timezone.now().isoformat(), 1])}
+            )
+            assert response.status_code == 200
@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_reviews
+
+# Родительский объект и сама выборка; ETag запросов не добавляет.
+REVIEW_DETAIL_QUERIES = 2
+# Плюс подсчёт количества объектов для постраничной пагинации.
+REVIEW_LIST_QUERIES = REVIEW_DETAIL_QUERIES + 1
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ReviewQueryBudget:
+
+    def check_queries(self, client, url, expected,
+                      django_assert_num_queries):
+        with CaptureQueriesContext(connection) as context:
+            with django_assert_num_queries(expected):
+                response = client.get(url)
+        assert response.status_code == 200
+        for query in context.captured_queries:
+            assert '"reviews_user"."bio"' not in query['sql'] and (
+                '"reviews_user"."password"' not in query['sql']
+            ), (
+                f'Проверьте, что GET-запрос к `{url}` не загружает био и '
+                'хеш пароля автора.'
+            )
+        return response.json()
+
+    def test_01_review_queries(self, client, admin_client, admin,
+                               user_client, user, moderator_client,
+                               moderator, django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client
+        })
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = self.check_queries(
+            client, url, REVIEW_LIST_QUERIES, django_assert_num_queries
+        )
+        assert {review['author'] for review in data['results']} == {
+            admin.username, user.username, moderator.username
+        }, (
+            f'Проверьте, что GET-запрос к `{url}` выполняет фиксированное '
+            'число запросов независимо от числа авторов.'
+        )
+        self.check_queries(
+            client, f'{url}{reviews[0]["id"]}/', REVIEW_DETAIL_QUERIES,
+            django_assert_num_queries
+        )
+
+    def test_02_comment_queries(self, client, admin_client, admin,
+                                user_client, user, moderator_client,
+                                moderator, django_assert_num_queries):
+        comments, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client
+        })
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        data = self.check_queries(
+            client, url, REVIEW_LIST_QUERIES, django_assert_num_queries
+        )
+        assert len(data['results']) > 1
+        self.check_queries(
+            client, f'{url}{comments[0]["id"]}/', REVIEW_DETAIL_QUERIES,
+            django_assert_num_queries
+        )
@@ -0,0 +1,90 @@
+import json
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ExplainQueries:
+
+    def run_command(self, **options):
+        stdout = StringIO()
+        call_command('explain_queries', titles=20, stdout=stdout, **options)
+        return json.loads(stdout.getvalue())
+
+    def test_01_report(self):
+        report = self.run_command()
+        names = {endpoint['name'] for endpoint in report['endpoints']}
+        for basename in ('titles', 'reviews', 'comments', 'categories',
+                         'genres', 'users'):
+            assert f'{basename}-list' in names, (
+                'Проверьте, что `explain_queries` обходит список '
+                f'`{basename}`.'
+            )
+        assert {'titles-detail', 'titles-list?genre',
+                'titles-score-distribution'} <= names
+        for endpoint in report['endpoints']:
+            assert endpoint['status'] == 200, endpoint['name']
+            for query in endpoint['queries']:
+                assert query['plan'], (
+                    'Проверьте, что `explain_queries` выполняет EXPLAIN '
+                    'QUERY PLAN для каждого запроса.'
+                )
+        fingerprints = [
+            finding['fingerprint'] for finding in report['findings']
+        ]
+        assert len(fingerprints) == len(set(fingerprints))
+        assert not Title.objects.exists(), (
+            'Проверьте, что `explain_queries` откатывает созданные данные.'
+        )
+
+    def test_02_fail_on_new_findings(self, tmp_path):
+        report = self.run_command()
+        scans = [
+            finding for finding in report['findings']
+            if finding['kind'] == 'table_scan'
+        ]
+        assert scans
+        assert all(
+            finding['suggested_index'] is None
+            or finding['suggested_index']['sql'].startswith('CREATE INDEX')
+            for finding in scans
+        )
+
+        baseline = tmp_path / 'baseline.json'
+        baseline.write_text(json.dumps(report), encoding='utf-8')
+        self.run_command(baseline=str(baseline), fail_on=['table_scan'])
+
+        report['findings'] = [
+            finding for finding in report['findings']
+            if finding['fingerprint'] != scans[0]['fingerprint']
+        ]
+        baseline.write_text(json.dumps(report), encoding='utf-8')
+        fingerprint = re.escape(scans[0]['fingerprint'])
+        with pytest.raises(CommandError, match=fingerprint):
+            self.run_command(baseline=str(baseline), fail_on=['table_scan'])
+
+    def test_03_user_filters_use_indexes(self):
+        report = self.run_command()
+        assert not report['skipped_filters'], (
+            'Проверьте, что `explain_queries` задаёт значения для всех '
+            f'фильтров: пропущены {report["skipped_filters"]}.'
+        )
+        plans = {
+            endpoint['name']: ' '.join(endpoint['queries'][0]['plan'])
+            for endpoint in report['endpoints']
+        }
+        for variant, index in (
+            ('username', 'sqlite_autoindex_reviews_user_'),
+            ('email', 'user_email_normalized_idx'),
+            ('role', 'user_role_idx'),
+            ('search', 'user_username_normalized_idx'),
+        ):
+            assert f'USING INDEX {index}' in plans[f'users-list?{variant}'], (
+                f'Проверьте, что фильтр пользователей `{variant}` идёт по '
+                f'индексу `{index}`.'
+            )
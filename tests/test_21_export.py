@@ -0,0 +1,102 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+
+from reviews.models import Review
+from tests.utils import create_comments
+
+
+def read_ndjson(content):
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Export:
+
+    def test_01_permissions(self, client, user_client, admin_client):
+        url = '/api/v1/export/reviews/'
+        assert client.get(url).status_code == 401
+        assert user_client.get(url).status_code == 403, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+        assert admin_client.get('/api/v1/export/users/').status_code == 404
+        response = admin_client.get(url, {'since': 'вчера'})
+        assert response.status_code == 400
+
+    def test_02_ndjson(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = '/api/v1/export/reviews/'
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert isinstance(response, StreamingHttpResponse), (
+            f'Проверьте, что `{url}` отдаёт выгрузку потоком.'
+        )
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = read_ndjson(b''.join(response.streaming_content))
+        assert [row['id'] for row in rows] == sorted(
+            review['id'] for review in reviews
+        )
+        assert {row['author'] for row in rows} == {
+            admin.username, user.username
+        }
+
+        rows = read_ndjson(b''.join(
+            admin_client.get('/api/v1/export/comments/').streaming_content
+        ))
+        assert [row['id'] for row in rows] == sorted(
+            comment['id'] for comment in comments
+        )
+        assert rows[0]['title'] == titles[0]['id']
+
+    def test_03_since(self, admin_client, admin, user_client, user):
+        _, reviews, _ = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        last = Review.objects.order_by('pk').last()
+        Review.objects.exclude(pk=last.pk).update(
+            pub_date='2000-01-01T00:00:00Z'
+        )
+        response = admin_client.get(
+            '/api/v1/export/reviews/', {'since': '2010-01-01T00:00:00Z'}
+        )
+        rows = read_ndjson(b''.join(response.streaming_content))
+        assert [row['id'] for row in rows] == [last.pk], (
+            'Проверьте, что параметр `since` отбирает отзывы по `pub_date`.'
+        )
+
+    def test_04_csv_gzip(self, admin_client, admin, user_client, user):
+        _, _, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        response = admin_client.get(
+            '/api/v1/export/titles/', {'format': 'csv'},
+            HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        assert response.status_code == 200
+        assert response['Content-Encoding'] == 'gzip'
+        assert response['Content-Type'].startswith('text/csv')
+        content = gzip.decompress(b''.join(response.streaming_content))
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        assert [int(row['id']) for row in rows] == sorted(
+            title['id'] for title in titles
+        )
+        title = next(
+            title for title in titles if title['id'] == int(rows[0]['id'])
+        )
+        assert rows[0]['genre'].split() == sorted(title['genre'])
+
+    def test_05_command(self, admin_client, admin, tmp_path):
+        _, reviews, _ = create_comments(admin_client, {admin: admin_client})
+        output = tmp_path / 'reviews.ndjson.gz'
+        call_command('export_data', 'reviews', gzip=True, output=str(output))
+        rows = read_ndjson(gzip.decompress(output.read_bytes()))
+        assert [row['id'] for row in rows] == sorted(
+            review['id'] for review in reviews
+        )
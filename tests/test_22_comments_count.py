@@ -0,0 +1,87 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review
+from tests.utils import create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22CommentsCount:
+
+    def check_count(self, review_id, expected):
+        assert Review.objects.get(pk=review_id).comments_count == expected, (
+            'Проверьте, что поле `comments_count` отзыва обновляется при '
+            'создании и удалении комментариев.'
+        )
+
+    def test_01_count_on_comment_changes(self, client, admin_client, admin,
+                                         user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        review_id = reviews[0]['id']
+        self.check_count(review_id, 2)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{review_id}/'
+        assert client.get(url).json()['comments_count'] == 2, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            '`comments_count`.'
+        )
+
+        response = admin_client.patch(url, data={'comments_count': 100})
+        assert response.status_code == 200
+        self.check_count(review_id, 2)
+
+        response = admin_client.delete(f'{url}comments/{comments[0]["id"]}/')
+        assert response.status_code == 204
+        self.check_count(review_id, 1)
+
+    def test_02_count_on_user_delete(self, admin_client, admin,
+                                     user_client, user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'ещё'
+        )
+        self.check_count(reviews[0]['id'], 3)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        call_command('purge_deleted', stdout=StringIO())
+        self.check_count(reviews[0]['id'], 1)
+
+    def test_03_recalculate_command(self, admin_client, admin,
+                                    user_client, user):
+        _, reviews, _ = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        Review.objects.update(comments_count=7)
+
+        stdout = StringIO()
+        call_command('recalculate_comments_counts', stdout=stdout)
+        self.check_count(reviews[0]['id'], 2)
+        self.check_count(reviews[1]['id'], 0)
+        assert 'Исправлено отзывов: 2' in stdout.getvalue()
+
+    def test_04_count_in_comment_transaction(self, admin_client, admin,
+                                             monkeypatch):
+        comments, reviews, _ = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        review = Review.objects.get(pk=reviews[0]['id'])
+
+        def fail(review_id, delta):
+            raise RuntimeError('сбой между запросами')
+
+        monkeypatch.setattr('reviews.signals.update_comments_count', fail)
+        with pytest.raises(RuntimeError):
+            Comment.objects.create(author=admin, review=review, text='ещё')
+        with pytest.raises(RuntimeError):
+            Comment.objects.get(pk=comments[0]['id']).delete()
+        assert Comment.objects.filter(review=review).count() == 1, (
+            'Проверьте, что комментарий и `comments_count` сохраняются в '
+            'одной транзакции.'
+        )
+        self.check_count(review.pk, 1)
@@ -0,0 +1,105 @@
+import asyncio
+import io
+import json
+import threading
+
+import pytest
+from django.test import AsyncClient
+from django.urls import resolve
+
+from api import async_views
+from api_yamdb.asgi import application
+from tests.utils import create_comments
+
+ASGI_URLCONF = 'api_yamdb.asgi_urls'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ASGI:
+
+    def test_01_reads_match_sync(self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        async_client = AsyncClient()
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}'
+            '/comments/',
+        ):
+            response = asyncio.run(async_client.get(url))
+            assert response.status_code == 200
+            assert response.json() == client.get(url).json(), (
+                f'Проверьте, что под ASGI `{url}` отвечает так же, как под '
+                'WSGI.'
+            )
+
+    def test_02_writes_work(self, token_admin):
+        async_client = AsyncClient()
+        response = asyncio.run(async_client.post(
+            '/api/v1/categories/',
+            json.dumps({'name': 'Фильм', 'slug': 'films'}),
+            content_type='application/json',
+            authorization=f'Bearer {token_admin["access"]}'
+        ))
+        assert response.status_code == 201
+
+    @pytest.mark.parametrize(
+        'workers, urlconf', ((0, None), (4, ASGI_URLCONF))
+    )
+    def test_03_read_pool_setting(self, settings, workers, urlconf):
+        settings.ASYNC_READ_WORKERS = workers
+        request, _ = application.create_request({
+            'type': 'http', 'method': 'GET', 'path': '/api/v1/titles/',
+            'query_string': b'', 'headers': [],
+        }, io.BytesIO())
+        assert getattr(request, 'urlconf', None) == urlconf, (
+            'Проверьте, что пул чтения под ASGI включается только при '
+            'ASYNC_READ_WORKERS > 0.'
+        )
+
+    def test_04_read_pool(self, settings, client, admin_client, admin,
+                          monkeypatch):
+        settings.ASYNC_READ_WORKERS = 4
+        settings.ROOT_URLCONF = ASGI_URLCONF
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        )
+        for url in urls:
+            assert asyncio.iscoroutinefunction(
+                resolve(url, ASGI_URLCONF).func
+            ), (
+                f'Проверьте, что с пулом чтения `{url}` обслуживается '
+                'асинхронным представлением.'
+            )
+        assert not asyncio.iscoroutinefunction(
+            resolve('/api/v1/categories/', ASGI_URLCONF).func
+        )
+        threads = set()
+        run_read = async_views.run_read
+
+        def tracked_run_read(*args, **kwargs):
+            threads.add(threading.current_thread().name)
+            return run_read(*args, **kwargs)
+
+        monkeypatch.setattr(async_views, 'run_read', tracked_run_read)
+        async_client = AsyncClient()
+        for url in urls:
+            response = asyncio.run(async_client.get(url))
+            assert response.status_code == 200
+            assert response.json() == client.get(url).json(), (
+                f'Проверьте, что с пулом чтения `{url}` отвечает так же, как '
+                'под WSGI.'
+            )
+        assert threads and all(
+            name.startswith('api-read') for name in threads
+        ), 'Проверьте, что чтение выполняется в пуле потоков `api-read`.'
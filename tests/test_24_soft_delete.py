@@ -0,0 +1,132 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Comment, Review, Title, User
+from tests.utils import create_comments, create_single_comment
+
+
+def purge(**options):
+    stdout = StringIO()
+    call_command('purge_deleted', stdout=stdout, **options)
+    return stdout.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SoftDelete:
+
+    def test_01_title_soft_delete(self, client, admin_client, admin,
+                                  user_client, user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/'
+        assert admin_client.delete(url).status_code == 204
+        assert client.get(url).status_code == 404, (
+            'Проверьте, что удалённое произведение скрыто из API.'
+        )
+        assert client.get(f'{url}reviews/').status_code == 404
+        assert client.get(
+            f'{url}reviews/{reviews[0]["id"]}/comments/'
+        ).status_code == 404
+        assert title_id not in [
+            title['id'] for title in client.get('/api/v1/titles/').json()[
+                'results'
+            ]
+        ]
+        assert Review.objects.filter(title_id=title_id).exists(), (
+            'Проверьте, что DELETE-запрос помечает произведение удалённым, '
+            'не удаляя отзывы сразу.'
+        )
+
+        output = purge(batch_size=1)
+        assert not Title.all_objects.filter(pk=title_id).exists()
+        assert not Review.objects.filter(title_id=title_id).exists()
+        assert not Comment.objects.filter(review__title_id=title_id).exists()
+        assert f'Title {title_id}: comments 2' in output, (
+            'Проверьте, что `purge_deleted` сообщает о ходе удаления.'
+        )
+        assert 'Удалено объектов: 1' in output
+        assert Title.objects.filter(pk=titles[1]['id']).exists()
+
+    def test_02_user_soft_delete(self, client, admin_client, admin,
+                                 user_client, user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        create_single_comment(
+            admin_client, titles[0]['id'], reviews[1]['id'], 'ответ'
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert admin_client.delete(
+            f'/api/v1/users/{user.username}/'
+        ).status_code == 204
+        assert admin_client.get(
+            f'/api/v1/users/{user.username}/'
+        ).status_code == 404
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что токен удалённого пользователя перестаёт '
+            'действовать.'
+        )
+        assert [
+            review['author'] for review in client.get(reviews_url).json()[
+                'results'
+            ]
+        ] == [admin.username], (
+            'Проверьте, что отзывы удалённого пользователя скрыты из API.'
+        )
+        comments = client.get(
+            f'{reviews_url}{reviews[0]["id"]}/comments/'
+        ).json()['results']
+        assert [comment['author'] for comment in comments] == [
+            admin.username
+        ]
+
+        purge(batch_size=1)
+        assert not Review.objects.filter(author=user).exists()
+        assert not Comment.objects.filter(author=user).exists()
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 1
+        assert User.all_objects.filter(pk=user.pk).exists(), (
+            'Проверьте, что строка пользователя хранится, пока не истекли '
+            'его токены доступа.'
+        )
+
+        User.all_objects.filter(pk=user.pk).update(
+            deleted_at=timezone.now()
+            - settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+        )
+        assert 'Удалено объектов: 1' in purge()
+        assert not User.all_objects.filter(pk=user.pk).exists()
+        assert purge().strip().endswith('Удалено объектов: 0')
+
+    def test_03_recreate_deleted_user(self, admin_client, user, moderator):
+        url = '/api/v1/users/'
+        data = {'username': user.username, 'email': user.email}
+        assert admin_client.delete(f'{url}{user.username}/').status_code == 204
+        for fields in (data, {**data, 'username': 'other'},
+                       {**data, 'email': 'other@yamdb.fake'}):
+            response = admin_client.post(url, data=fields)
+            assert response.status_code == 400, (
+                'Проверьте, что username и email удалённого пользователя '
+                'заняты до его окончательного удаления: ответ 400, а не '
+                'ошибка сервера.'
+            )
+        response = admin_client.patch(
+            f'{url}{moderator.username}/', data={'username': user.username}
+        )
+        assert response.status_code == 400
+
+        User.all_objects.filter(pk=user.pk).update(
+            deleted_at=timezone.now()
+            - settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+        )
+        purge()
+        response = admin_client.post(url, data=data)
+        assert response.status_code == 201, (
+            'Проверьте, что после purge_deleted пользователя можно создать '
+            'заново.'
+        )
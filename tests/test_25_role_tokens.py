@@ -0,0 +1,169 @@
+import pytest
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import auth_versions
+from reviews.models import User
+from tests.utils import create_single_review, create_titles
+
+
+def issue_token(client, user):
+    response = client.post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == 201
+    token = response.json()['token']
+    token_client = APIClient()
+    token_client.credentials(HTTP_AUTHORIZATION=token)
+    return AccessToken(token.split()[1]), token_client
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "reviews_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25RoleTokens:
+
+    def test_01_token_claims(self, client, admin, user):
+        token, admin_token_client = issue_token(client, admin)
+        assert token['role'] == 'admin'
+        assert token['auth_version'] == 0
+        assert token['username'] == admin.username
+
+        auth_versions.current(admin.pk)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_token_client.post(
+                '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'film'}
+            )
+        assert response.status_code == 201
+        assert not user_queries(context), (
+            'Проверьте, что права администратора проверяются по токену, '
+            'без загрузки пользователя из БД.'
+        )
+
+        _, user_token_client = issue_token(client, user)
+        response = user_token_client.post(
+            '/api/v1/categories/', data={'name': 'Книга', 'slug': 'book'}
+        )
+        assert response.status_code == 403
+
+    def test_02_review_with_token_user(self, client, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        _, user_token_client = issue_token(client, user)
+        data = create_single_review(
+            user_token_client, titles[0]['id'], 'Отзыв', 5
+        ).json()
+        assert data['author'] == user.username
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = user_token_client.post(
+            url, data={'text': 'Ещё', 'score': 1}
+        )
+        assert response.status_code == 400
+        response = user_token_client.patch(
+            f'{url}{data["id"]}/', data={'text': 'Новый текст'}
+        )
+        assert response.status_code == 200
+        response = user_token_client.get('/api/v1/users/me/')
+        assert response.status_code == 200
+        assert response.json()['username'] == user.username
+
+    def test_03_role_change_revokes_tokens(self, client, admin_client, user):
+        _, old_client = issue_token(client, user)
+        assert old_client.get('/api/v1/users/me/').status_code == 200
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'bio': 'Новое био'}
+        )
+        assert response.status_code == 200
+        assert old_client.get('/api/v1/users/me/').status_code == 200, (
+            'Проверьте, что изменение профиля без смены роли не отзывает '
+            'токены.'
+        )
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == 200
+        assert old_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что после смены роли старые токены пользователя '
+            'отклоняются.'
+        )
+        user.refresh_from_db()
+        token, new_client = issue_token(client, user)
+        assert token['role'] == 'admin'
+        assert new_client.get('/api/v1/users/').status_code == 200
+
+    def test_04_delete_revokes_tokens(self, client, admin_client, user):
+        _, token_client = issue_token(client, user)
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert token_client.get('/api/v1/users/me/').status_code == 401
+
+    def test_05_revocation_from_other_process(self, client, user):
+        _, token_client = issue_token(client, user)
+        assert token_client.get('/api/v1/users/me/').status_code == 200
+        # Роль сменили в другом процессе: здесь это видно после
+        # перечитывания версий из БД.
+        User.objects.filter(pk=user.pk).update(
+            auth_version=1, auth_revoked_at=timezone.now()
+        )
+        assert token_client.get('/api/v1/users/me/').status_code == 200
+        auth_versions.loaded_at -= settings.AUTH_VERSIONS_REFRESH + 1
+        assert token_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что процесс периодически перечитывает версии '
+            'авторизации из БД.'
+        )
+
+    def test_06_only_recent_revocations(self, admin, user, moderator):
+        lifetime = settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+        for revoked_user in (admin, user, moderator):
+            revoked_user.revoke_tokens()
+            revoked_user.save()
+        User.objects.filter(pk=admin.pk).update(
+            auth_revoked_at=timezone.now() - lifetime
+        )
+        auth_versions.clear()
+        auth_versions.load()
+        assert set(auth_versions.versions) == {user.pk, moderator.pk}, (
+            'Проверьте, что загружаются только отзывы токенов за последние '
+            'ACCESS_TOKEN_LIFETIME.'
+        )
+        plan = auth_versions.revocations(timezone.now() - lifetime).explain()
+        assert 'user_auth_revoked_idx' in plan, (
+            f'Проверьте, что недавние отзывы читаются по индексу: {plan}'
+        )
+
+    def test_07_save_revokes_on_auth_fields(self, client, admin):
+        _, token_client = issue_token(client, admin)
+        assert token_client.get('/api/v1/users/').status_code == 200
+        admin = User.objects.get(pk=admin.pk)
+        admin.bio = 'Био'
+        admin.save()
+        admin.save(update_fields=('bio',))
+        assert admin.auth_version == 0, (
+            'Проверьте, что сохранение без смены роли не отзывает токены.'
+        )
+        # Понижение через админку или shell: обычный save().
+        admin.role = 'user'
+        admin.save()
+        assert User.objects.get(pk=admin.pk).auth_version == 1
+        admin.save()
+        assert admin.auth_version == 1
+        auth_versions.loaded_at -= settings.AUTH_VERSIONS_REFRESH + 1
+        assert token_client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что смена роли через User.save() отзывает токены.'
+        )
+
+        user = User.objects.get(pk=admin.pk)
+        user.is_active = False
+        user.save(update_fields=('is_active',))
+        assert User.objects.get(pk=admin.pk).auth_version == 2
@@ -0,0 +1,159 @@
+import smtplib
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail, User
+from reviews.outbox import claim, claim_batch, deliver_pending, enqueue_email
+
+BACKEND = 'tests.test_26_email_outbox.{}'
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        if any('fail' in address for message in messages
+               for address in message.to):
+            raise smtplib.SMTPRecipientsRefused({})
+        return super().send_messages(messages)
+
+
+class DownBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('почтовый сервер недоступен')
+
+
+def deliver(**options):
+    stdout = StringIO()
+    call_command('deliver_emails', stdout=stdout, **options)
+    return stdout.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26EmailOutbox:
+
+    @pytest.fixture(autouse=True)
+    def queued_outbox(self, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+
+    def test_01_signup_enqueues_email(self, client):
+        outbox_count = len(mail.outbox)
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == outbox_count, (
+            'Проверьте, что при регистрации письмо не отправляется в '
+            'запросе, а ставится в очередь.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.to == data['email'] and email.sent_at is None
+
+        assert deliver() == 'Отправлено: 1, ошибок: 0\n'
+        assert len(mail.outbox) == outbox_count + 1
+        assert mail.outbox[-1].to == [data['email']]
+        assert OutgoingEmail.objects.get().sent_at is not None
+        assert deliver() == 'Отправлено: 0, ошибок: 0\n'
+
+    def test_02_failed_signup_leaves_no_email(self, client, user):
+        response = client.post('/api/v1/auth/signup/', data={
+            'email': user.email, 'username': 'another'
+        })
+        assert response.status_code == 400
+        assert not OutgoingEmail.objects.exists(), (
+            'Проверьте, что письмо пишется в одной транзакции с '
+            'пользователем.'
+        )
+        assert User.objects.count() == 1
+
+    def test_03_batches_share_connection(self, settings):
+        settings.EMAIL_BACKEND = BACKEND.format('CountingBackend')
+        CountingBackend.opened = 0
+        for index in range(5):
+            enqueue_email('Тема', 'Текст', 'webmaster@localhost',
+                          f'user{index}@yamdb.fake')
+        assert deliver(batch_size=2) == 'Отправлено: 5, ошибок: 0\n'
+        assert CountingBackend.opened == 3, (
+            'Проверьте, что пачка писем отправляется через одно соединение.'
+        )
+
+    def test_04_retry_with_backoff(self, settings):
+        settings.EMAIL_BACKEND = BACKEND.format('FailingBackend')
+        enqueue_email('Тема', 'Текст', 'webmaster@localhost', 'ok@yamdb.fake')
+        failed = enqueue_email(
+            'Тема', 'Текст', 'webmaster@localhost', 'fail@yamdb.fake'
+        )
+        assert deliver_pending(10) == (1, 1)
+        failed.refresh_from_db()
+        assert failed.sent_at is None and failed.attempts == 1
+        assert 'SMTPRecipientsRefused' in failed.last_error
+        first_delay = failed.send_after - timezone.now()
+        assert first_delay.total_seconds() > 0, (
+            'Проверьте, что повтор откладывается.'
+        )
+        assert deliver_pending(10) == (0, 0)
+
+        OutgoingEmail.objects.filter(pk=failed.pk).update(
+            send_after=timezone.now()
+        )
+        assert deliver_pending(10) == (0, 1)
+        failed.refresh_from_db()
+        assert failed.attempts == 2
+        assert failed.send_after - timezone.now() > first_delay, (
+            'Проверьте, что пауза перед повтором растёт с числом попыток.'
+        )
+
+        settings.EMAIL_BACKEND = BACKEND.format('CountingBackend')
+        OutgoingEmail.objects.filter(pk=failed.pk).update(
+            send_after=timezone.now()
+        )
+        assert deliver_pending(10) == (1, 0)
+
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+        settings.EMAIL_BACKEND = BACKEND.format('FailingBackend')
+        enqueue_email(
+            'Тема', 'Текст', 'webmaster@localhost', 'fail2@yamdb.fake'
+        )
+        assert deliver_pending(10) == (0, 1)
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        assert deliver_pending(10) == (0, 0), (
+            'Проверьте, что после EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо '
+            'больше не отправляется.'
+        )
+
+    def test_05_connection_failure(self, settings):
+        settings.EMAIL_BACKEND = BACKEND.format('DownBackend')
+        for index in range(3):
+            enqueue_email('Тема', 'Текст', 'webmaster@localhost',
+                          f'user{index}@yamdb.fake')
+        assert deliver() == 'Отправлено: 0, ошибок: 3\n'
+        assert set(OutgoingEmail.objects.values_list(
+            'attempts', flat=True
+        )) == {1}
+
+    def test_06_workers_claim_disjoint_batches(self):
+        for index in range(5):
+            enqueue_email('Тема', 'Текст', 'webmaster@localhost',
+                          f'user{index}@yamdb.fake')
+        pks = list(OutgoingEmail.objects.values_list('pk', flat=True))
+        first = claim(pks[:3])
+        # Второй воркер прочитал те же строки до того, как первый их
+        # забрал: условный UPDATE не отдаст их второй раз.
+        second = claim(pks)
+        assert {email.pk for email in first} == set(pks[:3])
+        assert {email.pk for email in second} == set(pks[3:]), (
+            'Проверьте, что письмо, забранное одним воркером, не забирает '
+            'другой.'
+        )
+        assert len({email.lease for email in first + second}) == 2
+        assert claim_batch(10) == []
@@ -0,0 +1,105 @@
+import pytest
+
+from api.throttling import SlidingWindowThrottle
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {'now': 7200.0}
+    monkeypatch.setattr(
+        SlidingWindowThrottle, 'timer', lambda self: clock['now']
+    )
+    return clock
+
+
+def get_token(client, username):
+    return client.post(TOKEN_URL, data={
+        'username': username, 'confirmation_code': 'wrong'
+    })
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27AuthThrottling:
+
+    def test_01_signup_username_limit(self, client, clock,
+                                      django_assert_num_queries):
+        for index in range(5):
+            response = client.post(SIGNUP_URL, data={
+                'username': 'flood', 'email': f'flood{index}@yamdb.fake'
+            })
+            assert response.status_code != 429
+        with django_assert_num_queries(0):
+            response = client.post(SIGNUP_URL, data={
+                'username': 'Flood', 'email': 'flood@yamdb.fake'
+            })
+        assert response.status_code == 429, (
+            'Проверьте, что регистрация с одним username ограничена по '
+            'частоте и отклоняется без запросов к БД.'
+        )
+        assert int(response['Retry-After']) == 3600
+        response = client.post(SIGNUP_URL, data={
+            'username': 'other', 'email': 'other@yamdb.fake'
+        })
+        assert response.status_code == 200
+
+    def test_02_token_limits(self, client, clock, user):
+        for _ in range(10):
+            assert get_token(client, user.username).status_code == 400
+        response = get_token(client, user.username)
+        assert response.status_code == 429, (
+            'Проверьте, что подбор кода для одного username ограничен.'
+        )
+        assert 'Retry-After' in response
+        for index in range(49):
+            assert get_token(client, f'user{index}').status_code != 429
+        assert get_token(client, 'another').status_code == 429, (
+            'Проверьте, что запросы токена ограничены и по IP.'
+        )
+        other_ip = client.post(
+            TOKEN_URL, data={'username': 'another', 'confirmation_code': 1},
+            REMOTE_ADDR='10.0.0.2'
+        )
+        assert other_ip.status_code == 404
+
+    def test_03_sliding_window(self, client, clock, user):
+        for _ in range(10):
+            get_token(client, user.username)
+        response = get_token(client, user.username)
+        assert int(response['Retry-After']) == 60
+
+        # Середина следующего окна: половина прошлых запросов ещё в счёте.
+        clock['now'] += 90
+        for _ in range(5):
+            assert get_token(client, user.username).status_code == 400
+        assert get_token(client, user.username).status_code == 429, (
+            'Проверьте, что окно скользящее, а не фиксированное.'
+        )
+        clock['now'] += 6
+        assert get_token(client, user.username).status_code == 400
+
+    def test_04_non_object_body(self, client):
+        for url in (SIGNUP_URL, TOKEN_URL):
+            response = client.post(
+                url, data=[1, 2], content_type='application/json'
+            )
+            assert response.status_code == 400, (
+                f'Проверьте, что POST-запрос к `{url}` с JSON-массивом '
+                'возвращает 400, а не ошибку сервера.'
+            )
+
+    def test_05_spoofed_forwarded_for(self, client, clock):
+        statuses = [
+            client.post(SIGNUP_URL, data={
+                'username': f'spoof{index}',
+                'email': f'spoof{index}@yamdb.fake',
+            }, HTTP_X_FORWARDED_FOR=f'10.1.0.{index}').status_code
+            for index in range(21)
+        ]
+        assert statuses[:20] == [200] * 20
+        assert statuses[20] == 429, (
+            'Проверьте, что лимит по IP нельзя обойти подставным '
+            'заголовком X-Forwarded-For.'
+        )
@@ -0,0 +1,105 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken, auth_versions
+from api.views import CommentViewSet, ReviewViewSet
+from tests.utils import create_comments
+
+# Родительский объект и сам объект: права проверяются без запросов.
+FORBIDDEN_QUERIES = 2
+# Плюс транзакция, старая оценка для рейтинга и UPDATE.
+REVIEW_PATCH_QUERIES = FORBIDDEN_QUERIES + 3
+# Плюс транзакция, review_id до изменения для comments_count и UPDATE.
+COMMENT_PATCH_QUERIES = FORBIDDEN_QUERIES + 3
+
+
+def token_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28PermissionQueries:
+
+    @pytest.fixture
+    def objects(self, admin_client, admin, user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        review_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+        )
+        comment_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            f'comments/{comments[1]["id"]}/'
+        )
+        # Версии авторизации процесс загружает один раз, не в замере.
+        auth_versions.current(user.pk)
+        return review_url, comment_url
+
+    def request_queries(self, client, method, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method)(url, data=data)
+        for query in context.captured_queries:
+            assert not query['sql'].startswith('SELECT') or (
+                'FROM "reviews_user"' not in query['sql']
+            ), (
+                f'Проверьте, что {method.upper()}-запрос к `{url}` не '
+                'загружает пользователей для проверки прав.'
+            )
+        return response.status_code, len(context.captured_queries)
+
+    def test_01_patch_queries(self, objects, user, moderator, admin,
+                              monkeypatch):
+        review_url, comment_url = objects
+        cases = (
+            (review_url, ReviewViewSet, REVIEW_PATCH_QUERIES),
+            (comment_url, CommentViewSet, COMMENT_PATCH_QUERIES),
+        )
+        for url, viewset, expected in cases:
+            for actor in (user, moderator, admin):
+                status, queries = self.request_queries(
+                    token_client(actor), 'patch', url, {'text': 'Правка'}
+                )
+                assert status == 200
+                assert queries == expected, (
+                    f'Проверьте, что PATCH-запрос к `{url}` от '
+                    f'{actor.username} выполняет {expected} запросов, '
+                    f'а не {queries}.'
+                )
+            with monkeypatch.context() as patch:
+                patch.setattr(viewset, 'permission_classes', (AllowAny,))
+                _, without_permissions = self.request_queries(
+                    token_client(user), 'patch', url, {'text': 'Правка'}
+                )
+            assert without_permissions == expected, (
+                'Проверьте, что проверка прав не добавляет запросов.'
+            )
+
+    def test_02_forbidden_queries(self, objects, django_user_model):
+        other = django_user_model.objects.create_user(
+            username='Other', email='other@yamdb.fake'
+        )
+        for url in objects:
+            for method in ('patch', 'delete'):
+                status, queries = self.request_queries(
+                    token_client(other), method, url, {'text': 'Чужое'}
+                )
+                assert status == 403
+                assert queries == FORBIDDEN_QUERIES, (
+                    f'Проверьте, что отказ в {method.upper()}-запросе к '
+                    f'`{url}` не требует запросов сверх поиска объекта.'
+                )
+
+    def test_03_delete_queries(self, objects, moderator):
+        for url in reversed(objects):
+            status, _ = self.request_queries(
+                token_client(moderator), 'delete', url
+            )
+            assert status == 204
@@ -0,0 +1,87 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api.filters import UserFilter
+from reviews.models import User
+
+URL = '/api/v1/users/'
+
+
+def usernames(response):
+    assert response.status_code == 200
+    return [user['username'] for user in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29UserSearch:
+
+    @pytest.fixture
+    def users(self, django_user_model):
+        for username, role in (
+            ('Alice', 'user'), ('alicia', 'moderator'), ('Bob', 'user'),
+            ('malice', 'moderator'),
+        ):
+            django_user_model.objects.create_user(
+                username=username, email=f'{username}@YaMDb.fake', role=role
+            )
+
+    def test_01_prefix_search(self, admin_client, users):
+        assert usernames(admin_client.get(f'{URL}?search=ALI')) == [
+            'Alice', 'alicia'
+        ], (
+            'Проверьте, что `?search=` ищет по началу username без учёта '
+            'регистра.'
+        )
+        assert usernames(admin_client.get(f'{URL}?search=lic')) == []
+
+    def test_02_exact_filters(self, admin_client, users):
+        assert usernames(admin_client.get(f'{URL}?username=Alice')) == [
+            'Alice'
+        ]
+        assert usernames(admin_client.get(f'{URL}?username=alice')) == []
+        assert usernames(admin_client.get(f'{URL}?role=moderator')) == [
+            'alicia', 'malice'
+        ]
+        assert usernames(
+            admin_client.get(f'{URL}?email=BOB@yamdb.FAKE')
+        ) == ['Bob']
+        response = admin_client.get(f'{URL}?role=superadmin')
+        assert response.status_code == 400
+
+    def test_03_filters_use_indexes(self, users):
+        for params, index in (
+            ({'search': 'ali'}, 'user_username_normalized_idx'),
+            ({'role': 'moderator'}, 'user_role_idx'),
+            ({'email': 'bob@yamdb.fake'}, 'user_email_normalized_idx'),
+            ({'username': 'Bob'}, 'sqlite_autoindex_reviews_user'),
+        ):
+            plan = UserFilter(params, queryset=User.objects.all()).qs.explain()
+            assert index in plan and 'SCAN' not in plan.replace(
+                'SCAN CONSTANT', ''
+            ), (
+                f'Проверьте, что фильтр {params} использует индекс {index}: '
+                f'{plan}'
+            )
+
+    def test_04_normalized_on_save(self, users):
+        user = User.objects.get(username='Bob')
+        assert user.username_normalized == 'bob'
+        assert user.email_normalized == 'bob@yamdb.fake'
+        user.username = 'ROBERT'
+        user.save(update_fields=('username',))
+        user.refresh_from_db()
+        assert user.username_normalized == 'robert', (
+            'Проверьте, что username_normalized обновляется вместе с '
+            'username, в том числе при save(update_fields=...).'
+        )
+
+    def test_05_benchmark_command(self):
+        stdout = StringIO()
+        call_command('benchmark_user_search', users=300, repeat=1,
+                     stdout=stdout)
+        output = stdout.getvalue()
+        assert 'Создано пользователей: 300' in output
+        assert output.count('найдено') == 6
+        assert not User.objects.exists()
@@ -0,0 +1,152 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.authentication import RoleAccessToken
+from reviews.models import User
+
+URL = '/api/v1/users/bulk/'
+USERS_CSV = (
+    'id,username,email,role,bio,first_name,last_name\n'
+    '100,csv_user,csv_user@yamdb.fake,user,,,\n'
+    '101,csv_moder,csv_moder@yamdb.fake,moderator,Био,Имя,\n'
+    '102,TestUser,taken@yamdb.fake,user,,,\n'
+)
+
+
+def user_data(index, **fields):
+    return {
+        'username': f'partner{index}',
+        'email': f'partner{index}@yamdb.fake',
+        'role': 'moderator',
+        **fields,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30UserBulk:
+
+    def test_01_bulk_create(self, admin_client, user):
+        data = [
+            user_data(0, bio='Модератор'),
+            user_data(1, username=user.username),
+            user_data(2, email=user_data(0)['email']),
+            user_data(3, role='superadmin'),
+            user_data(4),
+        ]
+        response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == 207, (
+            f'Проверьте, что POST-запрос к `{URL}` с частью некорректных '
+            'элементов возвращает ответ со статусом 207.'
+        )
+        results = response.json()
+        assert results[0] == {
+            'username': 'partner0', 'email': 'partner0@yamdb.fake',
+            'first_name': None, 'last_name': None, 'bio': 'Модератор',
+            'role': 'moderator',
+        }
+        assert 'username' in results[1]['errors']
+        assert 'email' in results[2]['errors'], (
+            'Проверьте, что повтор email внутри пачки - ошибка.'
+        )
+        assert 'role' in results[3]['errors']
+        assert results[4]['username'] == 'partner4'
+        created = User.objects.get(username='partner4')
+        assert created.username_normalized == 'partner4'
+        assert not created.has_usable_password()
+
+        response = admin_client.post(URL, data=data[:1], format='json')
+        assert response.status_code == 400
+
+    def test_02_bulk_create_queries(self, admin_client):
+        query_counts = []
+        for start, size in ((0, 5), (100, 50)):
+            data = [user_data(start + index) for index in range(size)]
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(URL, data=data, format='json')
+            assert response.status_code == 201
+            query_counts.append(len(context.captured_queries))
+        assert query_counts[0] == query_counts[1], (
+            'Проверьте, что число запросов не растёт с размером пачки: '
+            f'{query_counts}.'
+        )
+        assert User.objects.filter(username__startswith='partner').count() == (
+            55
+        )
+
+    def test_03_bulk_permissions(self, user_client, moderator_client):
+        for client in (user_client, moderator_client):
+            response = client.post(URL, data=[user_data(0)], format='json')
+            assert response.status_code == 403
+        assert not User.objects.filter(username='partner0').exists()
+
+    def test_04_bulk_update_roles(self, admin_client, user, moderator):
+        token_client = APIClient()
+        token_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+        assert token_client.get('/api/v1/users/me/').status_code == 200
+        data = [
+            {'username': user.username, 'role': 'moderator'},
+            {'username': moderator.username, 'role': 'moderator'},
+            {'username': 'missing', 'role': 'admin'},
+        ]
+        response = admin_client.patch(URL, data=data, format='json')
+        assert response.status_code == 207
+        results = response.json()
+        assert results[:2] == data[:2]
+        assert 'username' in results[2]['errors']
+        user.refresh_from_db()
+        assert user.role == 'moderator' and user.auth_version == 1
+        moderator.refresh_from_db()
+        assert moderator.auth_version == 0, (
+            'Проверьте, что версия авторизации меняется только при смене '
+            'роли.'
+        )
+        assert token_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что смена роли в пачке отзывает токены.'
+        )
+
+    def test_05_import_users_command(self, user, tmp_path):
+        path = tmp_path / 'users.csv'
+        path.write_text(USERS_CSV, encoding='utf8')
+        stdout = StringIO()
+        call_command('import_users', str(path), stdout=stdout)
+        output = stdout.getvalue()
+        assert 'Строка 4:' in output and 'username' in output
+        assert 'Создано: 2, ошибок: 1' in output
+        moder = User.objects.get(username='csv_moder')
+        assert moder.role == 'moderator' and moder.bio == 'Био'
+        assert moder.last_name is None
+
+        path.write_text(
+            'username,role\ncsv_user,admin\nmissing,user\n', encoding='utf8'
+        )
+        stdout = StringIO()
+        call_command('import_users', str(path), roles=True, stdout=stdout)
+        assert 'Обновлено: 1, ошибок: 1' in stdout.getvalue()
+        assert User.objects.get(username='csv_user').role == 'admin'
+
+    def test_06_bulk_username_reserved(self, client, admin_client):
+        for username in ('bulk', 'Bulk'):
+            response = admin_client.post('/api/v1/users/', data={
+                'username': username, 'email': 'bulk@yamdb.fake'
+            })
+            assert response.status_code == 400, (
+                'Проверьте, что username `bulk` занят маршрутом '
+                f'`{URL}` и недоступен для создания.'
+            )
+        response = admin_client.post(
+            URL, data=[user_data(0, username='bulk')], format='json'
+        )
+        assert response.status_code == 400
+        assert 'username' in response.json()[0]['errors']
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'bulk', 'email': 'bulk@yamdb.fake'
+        })
+        assert response.status_code == 400
+        assert not User.objects.filter(username__iexact='bulk').exists()
@@ -0,0 +1,117 @@
+import datetime
+import re
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews import signup as signup_module
+from reviews.models import OutgoingEmail, User
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+DATA = {'username': 'repeat_user', 'email': 'repeat@yamdb.fake'}
+
+
+def last_code():
+    body = OutgoingEmail.objects.order_by('-pk').first().body
+    return re.search(r'Ваш код: (\S+)', body).group(1)
+
+
+@pytest.fixture(params=('upsert', 'get_or_create'))
+def signup_path(request, monkeypatch):
+    # Без нескольких ON CONFLICT (не SQLite или SQLite до 3.35) signup
+    # идёт прежним путём через get_or_create.
+    if request.param == 'get_or_create':
+        monkeypatch.setattr('reviews.signup.upsert_supported', lambda: False)
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31Signup:
+
+    def test_01_repeat_reuses_confirmation(self, client, signup_path):
+        assert client.post(SIGNUP_URL, data=DATA).status_code == 200
+        code = last_code()
+        response = client.post(SIGNUP_URL, data=DATA)
+        assert response.status_code == 200
+        assert response.json() == DATA
+        assert OutgoingEmail.objects.count() == 1, (
+            'Проверьте, что повторная регистрация в пределах '
+            'SIGNUP_CONFIRMATION_WINDOW не выпускает новый код.'
+        )
+
+        OutgoingEmail.objects.update(
+            created_at=OutgoingEmail.objects.get().created_at
+            - datetime.timedelta(seconds=settings.SIGNUP_CONFIRMATION_WINDOW)
+        )
+        assert client.post(SIGNUP_URL, data=DATA).status_code == 200
+        assert OutgoingEmail.objects.count() == 2, (
+            'Проверьте, что после окна повторная регистрация отправляет '
+            'код заново.'
+        )
+        assert User.objects.filter(username=DATA['username']).count() == 1
+        for confirmation_code in (code, last_code()):
+            response = client.post('/api/v1/auth/token/', data={
+                'username': DATA['username'],
+                'confirmation_code': confirmation_code,
+            })
+            assert response.status_code == 201
+
+    def test_02_conflicts(self, client, admin_client, user, signup_path):
+        users = User.objects.count()
+        for data in (
+            {'username': 'new_name', 'email': user.email},
+            {'username': user.username, 'email': 'new@yamdb.fake'},
+        ):
+            response = client.post(SIGNUP_URL, data=data)
+            assert response.status_code == 400
+        assert User.objects.count() == users
+        assert not OutgoingEmail.objects.exists()
+
+        assert client.post(SIGNUP_URL, data=DATA).status_code == 200
+        admin_client.delete(f'/api/v1/users/{DATA["username"]}/')
+        response = client.post(SIGNUP_URL, data=DATA)
+        assert response.status_code == 400, (
+            'Проверьте, что данные удалённого пользователя нельзя занять '
+            'повторной регистрацией.'
+        )
+
+    def test_03_single_statement(self, client, settings):
+        # Без немедленной доставки: её UPDATE к регистрации не относится.
+        settings.EMAIL_OUTBOX_EAGER = False
+        for expected in (('INSERT', 'INSERT'), ('INSERT', 'SELECT')):
+            with CaptureQueriesContext(connection) as context:
+                response = client.post(SIGNUP_URL, data=DATA)
+            assert response.status_code == 200
+            statements = [
+                query['sql'].split()[0]
+                for query in context.captured_queries
+                if query['sql'].split()[0] in ('INSERT', 'SELECT', 'UPDATE')
+            ]
+            assert tuple(statements) == expected, (
+                'Проверьте, что регистрация - один INSERT ... ON CONFLICT '
+                'и запись письма (или проверка уже отправленного кода): '
+                f'{statements}.'
+            )
+
+    def test_04_benchmark_command(self):
+        stdout = StringIO()
+        call_command('benchmark_signup', signups=50, stdout=stdout)
+        output = stdout.getvalue()
+        assert 'get_or_create' in output and 'upsert' in output
+        assert output.count('регистраций/с') == 2
+        assert not User.objects.exists()
+
+    def test_05_upsert_supported(self, monkeypatch):
+        assert signup_module.upsert_supported()
+        monkeypatch.setattr(signup_module.sqlite3, 'sqlite_version_info',
+                            (3, 34, 1))
+        assert not signup_module.upsert_supported(), (
+            'Проверьте, что на SQLite до 3.35 signup не использует '
+            'несколько ON CONFLICT.'
+        )
+        monkeypatch.setattr(signup_module.connection, 'vendor', 'postgresql')
+        assert not signup_module.upsert_supported()
@@ -1,3 +1,5 @@
+import base64
+import json
 from http import HTTPStatus
 
 
@@ -305,3 +307,9 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def make_cursor(position, reverse=0):
+    return base64.urlsafe_b64encode(
+        json.dumps({'p': position, 'r': reverse}).encode()
+    ).decode()